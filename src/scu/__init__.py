@@ -4,7 +4,7 @@ from .config import AppConfig, CaptureMode, Direction, ProcessOrder, WaitMode, S
 from .session import SessionController, SessionState
 from .pipeline import Pipeline
 from .output import SessionPathManager
-from .duplicates import SimpleDuplicateDetector
+from .duplicates import BloomDuplicateDetector, RingBufferDuplicateDetector, SimpleDuplicateDetector
 
 __all__ = [
     "AppConfig",
@@ -19,4 +19,6 @@ __all__ = [
     "Pipeline",
     "SessionPathManager",
     "SimpleDuplicateDetector",
+    "BloomDuplicateDetector",
+    "RingBufferDuplicateDetector",
 ]
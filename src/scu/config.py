@@ -1,10 +1,30 @@
 from __future__ import annotations
 
-import json
-from dataclasses import asdict, dataclass, field
+import os
+from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Callable, Dict, Optional, Tuple
+
+try:  # pragma: no cover - optional accelerated JSON codec
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    import json
+
+    orjson = None  # type: ignore[assignment]
+
+
+def _dumps(data: Dict[str, object]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+def _loads(payload: bytes) -> Dict[str, object]:
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload.decode("utf-8"))
 
 
 class CaptureMode(str, Enum):
@@ -37,12 +57,12 @@ class ImageFormat(str, Enum):
     PNG = "png"
     JPG = "jpg"
 
-    @property
-    def extension(self) -> str:
-        return ".jpg" if self is ImageFormat.JPG else ".png"
+    def __init__(self, value: str) -> None:
+        # Members are singletons, so the file extension is stored once per member.
+        self.extension = f".{value}"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class HotkeyConfig:
     pause: str = "Ctrl+Alt+P"
     stop: str = "Ctrl+Alt+S"
@@ -55,7 +75,69 @@ class HotkeyConfig:
         )
 
 
-@dataclass
+_HOME = Path.home()
+
+
+def _default_output_dir() -> Path:
+    return _HOME / "Pictures" / "SCU"
+
+
+def _expand_home(path: Path) -> Path:
+    parts = path.parts
+    if not parts or not parts[0].startswith("~"):
+        return path
+    if parts[0] == "~":
+        return _HOME.joinpath(*parts[1:])
+    return path.expanduser()
+
+
+def _optional(converter: Callable[[object], object]) -> Callable[[object], object]:
+    def _convert(value: object) -> object:
+        return None if value is None else converter(value)
+
+    return _convert
+
+
+def _enum_lookup(enum_cls: type) -> Callable[[object], object]:
+    members = enum_cls._value2member_map_  # type: ignore[attr-defined]
+
+    def _convert(value: object) -> object:
+        try:
+            return members[value]
+        except (KeyError, TypeError):  # TypeError: unhashable values such as lists
+            raise ValueError(f"{value!r} is not a valid {enum_cls.__name__}") from None
+
+    return _convert
+
+
+def _output_dir(value: object) -> Path:
+    return _default_output_dir() if value is None else Path(value)  # type: ignore[arg-type]
+
+
+# (key, default, converter) for every AppConfig field, built once so from_dict is a single loop.
+# Defaults must match the AppConfig field defaults so a missing key means the same everywhere.
+_APPCONFIG_FIELDS: Tuple[Tuple[str, object, Callable[[object], object]], ...] = (
+    ("monitor", 1, int),
+    ("capture_mode", CaptureMode.ACTIVE_WINDOW.value, _enum_lookup(CaptureMode)),
+    ("direction", Direction.RIGHT.value, _enum_lookup(Direction)),
+    ("count", 100, int),
+    ("delay", 0.5, float),
+    ("process_order", ProcessOrder.SHOT_FIRST.value, _enum_lookup(ProcessOrder)),
+    ("wait_mode", WaitMode.FIXED.value, _enum_lookup(WaitMode)),
+    ("wait_timeout", 5.0, _optional(float)),
+    ("min_overlap", 0.7, float),
+    ("output_dir", None, _output_dir),
+    ("image_format", ImageFormat.PNG.value, _enum_lookup(ImageFormat)),
+    ("jpeg_quality", 90, int),
+    ("hotkeys", {}, HotkeyConfig.from_dict),
+    ("session_mode", SessionMode.FIXED_COUNT.value, _enum_lookup(SessionMode)),
+    ("time_limit_seconds", None, _optional(int)),
+    ("auto_session_subdir", True, bool),
+    ("session_name_prefix", "session", str),
+)
+
+
+@dataclass(frozen=True, slots=True)
 class AppConfig:
     monitor: int = 1
     capture_mode: CaptureMode = CaptureMode.ACTIVE_WINDOW
@@ -66,7 +148,7 @@ class AppConfig:
     wait_mode: WaitMode = WaitMode.FIXED
     wait_timeout: Optional[float] = 5.0
     min_overlap: float = 0.7
-    output_dir: Path = field(default_factory=lambda: Path.home() / "Pictures" / "SCU")
+    output_dir: Path = field(default_factory=_default_output_dir)
     image_format: ImageFormat = ImageFormat.PNG
     jpeg_quality: int = 90
     hotkeys: HotkeyConfig = field(default_factory=HotkeyConfig)
@@ -90,44 +172,45 @@ class AppConfig:
             raise ValueError("wait_timeout is required for change detection mode")
         if self.session_mode == SessionMode.TIME_LIMIT and self.time_limit_seconds is None:
             raise ValueError("time_limit_seconds required for time-limit mode")
-        self.output_dir = Path(self.output_dir).expanduser()
+        output_dir = self.output_dir if isinstance(self.output_dir, Path) else Path(self.output_dir)
+        object.__setattr__(self, "output_dir", _expand_home(output_dir))
 
     def to_dict(self) -> Dict[str, object]:
-        data = asdict(self)
-        data["capture_mode"] = self.capture_mode.value
-        data["direction"] = self.direction.value
-        data["process_order"] = self.process_order.value
-        data["wait_mode"] = self.wait_mode.value
-        data["image_format"] = self.image_format.value
-        data["session_mode"] = self.session_mode.value
-        data["output_dir"] = str(self.output_dir)
-        data["hotkeys"] = asdict(self.hotkeys)
+        data = dict(_config_to_dict(self))
+        data["hotkeys"] = dict(data["hotkeys"])  # type: ignore[call-overload]
         return data
 
     @classmethod
     def from_dict(cls, data: Dict[str, object]) -> "AppConfig":
-        return cls(
-            monitor=int(data.get("monitor", 1)),
-            capture_mode=CaptureMode(data.get("capture_mode", CaptureMode.ACTIVE_WINDOW.value)),
-            direction=Direction(data.get("direction", Direction.RIGHT.value)),
-            count=int(data.get("count", 100)),
-            delay=float(data.get("delay", 0.5)),
-            process_order=ProcessOrder(data.get("process_order", ProcessOrder.SHOT_FIRST.value)),
-            wait_mode=WaitMode(data.get("wait_mode", WaitMode.FIXED.value)),
-            wait_timeout=float(data["wait_timeout"]) if data.get("wait_timeout") is not None else None,
-            min_overlap=float(data.get("min_overlap", 0.7)),
-            output_dir=Path(data.get("output_dir", Path.home() / "Pictures" / "SCU")),
-            image_format=ImageFormat(data.get("image_format", ImageFormat.PNG.value)),
-            jpeg_quality=int(data.get("jpeg_quality", 90)),
-            hotkeys=HotkeyConfig.from_dict(data.get("hotkeys", {})),
-            session_mode=SessionMode(data.get("session_mode", SessionMode.FIXED_COUNT.value)),
-            time_limit_seconds=int(data["time_limit_seconds"]) if data.get("time_limit_seconds") is not None else None,
-            auto_session_subdir=bool(data.get("auto_session_subdir", True)),
-            session_name_prefix=str(data.get("session_name_prefix", "session")),
-        )
-
-
-@dataclass
+        get = data.get
+        return cls(**{key: convert(get(key, default)) for key, default, convert in _APPCONFIG_FIELDS})
+
+
+@lru_cache(maxsize=64)
+def _config_to_dict(config: AppConfig) -> Dict[str, object]:
+    # AppConfig is frozen and hashable, so repeated saves of an unchanged config hit the cache.
+    return {
+        "monitor": config.monitor,
+        "capture_mode": config.capture_mode.value,
+        "direction": config.direction.value,
+        "count": config.count,
+        "delay": config.delay,
+        "process_order": config.process_order.value,
+        "wait_mode": config.wait_mode.value,
+        "wait_timeout": config.wait_timeout,
+        "min_overlap": config.min_overlap,
+        "output_dir": str(config.output_dir),
+        "image_format": config.image_format.value,
+        "jpeg_quality": config.jpeg_quality,
+        "hotkeys": {"pause": config.hotkeys.pause, "stop": config.hotkeys.stop},
+        "session_mode": config.session_mode.value,
+        "time_limit_seconds": config.time_limit_seconds,
+        "auto_session_subdir": config.auto_session_subdir,
+        "session_name_prefix": config.session_name_prefix,
+    }
+
+
+@dataclass(slots=True)
 class TemplateStore:
     recent: AppConfig = field(default_factory=AppConfig)
     templates: Dict[str, AppConfig] = field(default_factory=dict)
@@ -146,10 +229,12 @@ class TemplateStore:
 
     @classmethod
     def from_dict(cls, data: Dict[str, object]) -> "TemplateStore":
-        recent_data = data.get("recent", {})
-        templates_data = data.get("templates", {})
-        recent_cfg = AppConfig.from_dict(recent_data)
-        templates_cfg = {name: AppConfig.from_dict(cfg) for name, cfg in templates_data.items()}
+        if not data:
+            return cls()
+        recent_data = data.get("recent")
+        templates_data = data.get("templates")
+        recent_cfg = AppConfig.from_dict(recent_data) if recent_data else AppConfig()
+        templates_cfg = {name: AppConfig.from_dict(cfg) for name, cfg in templates_data.items()} if templates_data else {}
         return cls(recent=recent_cfg, templates=templates_cfg)
 
 
@@ -159,17 +244,38 @@ class ConfigRepository:
     def __init__(self, path: Optional[Path] = None) -> None:
         default_path = Path.home() / ".config" / "scu" / "config.json"
         self.path = path or default_path
+        self._cached: Optional[Tuple[Tuple[int, int], TemplateStore]] = None
 
     def load(self) -> TemplateStore:
-        if not self.path.exists():
+        try:
+            signature = self._file_signature()
+        except FileNotFoundError:
+            self._cached = None
             return TemplateStore()
-        data = json.loads(self.path.read_text(encoding="utf-8"))
-        return TemplateStore.from_dict(data)
+        if self._cached is None or self._cached[0] != signature:
+            data = _loads(self.path.read_bytes())
+            self._cached = (signature, TemplateStore.from_dict(data))
+        cached = self._cached[1]
+        # Hand out a shallow copy so callers mutating the store do not alter the cache.
+        return TemplateStore(recent=cached.recent, templates=dict(cached.templates))
 
     def save(self, store: TemplateStore) -> None:
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        payload = json.dumps(store.to_dict(), indent=2)
-        self.path.write_text(payload, encoding="utf-8")
+        payload = _dumps(store.to_dict())
+        # Write a sibling file and swap it in so a crash never leaves a torn config behind.
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        try:
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        snapshot = TemplateStore(recent=store.recent, templates=dict(store.templates))
+        self._cached = (self._file_signature(), snapshot)
+
+    def _file_signature(self) -> Tuple[int, int]:
+        stat = self.path.stat()
+        return stat.st_mtime_ns, stat.st_size
 
     def load_recent(self) -> AppConfig:
         return self.load().recent
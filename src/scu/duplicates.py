@@ -1,16 +1,161 @@
 from __future__ import annotations
 
-from typing import Set
+import hashlib
+import math
+from typing import Dict, List, Optional, Set
+
+from .interfaces import DuplicateDetector
+
+# Sessions expected to remember more hashes than this use the fixed-size Bloom filter.
+BLOOM_FILTER_THRESHOLD = 1000
+# Unbounded (time-limit and manual) sessions check repeats exactly against this many recent frames.
+UNBOUNDED_HISTORY = 10_000
 
 
 class SimpleDuplicateDetector:
     """In-memory duplicate detector for capture hashes."""
 
     def __init__(self) -> None:
-        self._hashes: Set[str] = set()
+        self._hashes: Set[bytes] = set()
 
-    def is_duplicate(self, hash_value: str) -> bool:
+    def is_duplicate(self, hash_value: bytes) -> bool:
         return hash_value in self._hashes
 
-    def remember(self, hash_value: str) -> None:
+    def remember(self, hash_value: bytes) -> None:
         self._hashes.add(hash_value)
+
+    def observe(self, hash_value: bytes) -> bool:
+        # A single set operation: the size only grows when the hash is new.
+        hashes = self._hashes
+        size = len(hashes)
+        hashes.add(hash_value)
+        return len(hashes) == size
+
+    def reset(self) -> None:
+        self._hashes.clear()
+
+
+class BloomDuplicateDetector:
+    """Fixed-size Bloom filter for capture hashes.
+
+    Memory is bounded by ``capacity`` rather than growing with every frame. A
+    false positive only results in a spurious duplicate warning, which is
+    acceptable for a best-effort check.
+    """
+
+    def __init__(self, capacity: int = 10_000, false_positive_rate: float = 0.01) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("false_positive_rate must be between 0 and 1")
+        bit_count = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self._bit_count = bit_count
+        self._hash_count = max(1, round(bit_count / capacity * math.log(2)))
+        self._bits = bytearray((bit_count + 7) // 8)
+
+    def is_duplicate(self, hash_value: bytes) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(hash_value))
+
+    def remember(self, hash_value: bytes) -> None:
+        bits = self._bits
+        for position in self._positions(hash_value):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def observe(self, hash_value: bytes) -> bool:
+        bits = self._bits
+        seen = True
+        for position in self._positions(hash_value):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                seen = False
+                bits[position >> 3] |= mask
+        return seen
+
+    def reset(self) -> None:
+        self._bits = bytearray(len(self._bits))
+
+    def _positions(self, hash_value: bytes) -> List[int]:
+        # The inputs are already uniform digests, so two 64-bit slices drive double hashing.
+        if len(hash_value) < 16:
+            hash_value = hashlib.blake2b(hash_value, digest_size=16).digest()
+        first = int.from_bytes(hash_value[:8], "little")
+        second = int.from_bytes(hash_value[8:16], "little") | 1
+        bit_count = self._bit_count
+        return [(first + i * second) % bit_count for i in range(self._hash_count)]
+
+
+class RingBufferDuplicateDetector:
+    """Remembers only the most recent ``capacity`` capture hashes.
+
+    Older hashes are evicted in insertion order, so memory stays bounded in
+    long sessions while recent repeats are still detected exactly. A bitset
+    keyed on the digest prefix rejects most new hashes before the dict lookup.
+    """
+
+    def __init__(self, capacity: int = 1024, filter_bits: int = 1 << 20) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        if filter_bits < 8 or filter_bits & (filter_bits - 1):
+            raise ValueError("filter_bits must be a power of two >= 8")
+        self._capacity = capacity
+        self._ring: List[Optional[bytes]] = [None] * capacity
+        self._counts: Dict[bytes, int] = {}
+        self._index = 0
+        self._mask = filter_bits - 1
+        self._filter = bytearray(filter_bits >> 3)
+
+    def is_duplicate(self, hash_value: bytes) -> bool:
+        position = int.from_bytes(hash_value[:8], "little") & self._mask
+        if not self._filter[position >> 3] & (1 << (position & 7)):
+            return False
+        return hash_value in self._counts
+
+    def remember(self, hash_value: bytes) -> None:
+        ring = self._ring
+        slot = self._index % self._capacity
+        counts = self._counts
+        evicted = ring[slot]
+        if evicted is not None:
+            remaining = counts[evicted] - 1
+            if remaining:
+                counts[evicted] = remaining
+            else:
+                del counts[evicted]
+        ring[slot] = hash_value
+        counts[hash_value] = counts.get(hash_value, 0) + 1
+        self._index += 1
+        if self._index % self._capacity == 0:
+            # Rebuild the prefilter once per lap so bits of evicted hashes do not accumulate
+            # over an unbounded session; amortised this is O(1) per frame.
+            self._filter = bytearray(len(self._filter))
+            for live in counts:
+                self._mark(live)
+        else:
+            self._mark(hash_value)
+
+    def _mark(self, hash_value: bytes) -> None:
+        position = int.from_bytes(hash_value[:8], "little") & self._mask
+        self._filter[position >> 3] |= 1 << (position & 7)
+
+    def observe(self, hash_value: bytes) -> bool:
+        seen = self.is_duplicate(hash_value)
+        self.remember(hash_value)
+        return seen
+
+    def reset(self) -> None:
+        self._ring = [None] * self._capacity
+        self._counts.clear()
+        self._index = 0
+        self._filter = bytearray(len(self._filter))
+
+
+def create_duplicate_detector(expected_captures: Optional[int] = None) -> DuplicateDetector:
+    """Pick a detector for a session expecting ``expected_captures`` frames (None if unbounded)."""
+
+    if expected_captures is None:
+        # A fixed-size filter would fill up and report false duplicates as the session runs on.
+        return RingBufferDuplicateDetector(capacity=UNBOUNDED_HISTORY)
+    if expected_captures <= BLOOM_FILTER_THRESHOLD:
+        return SimpleDuplicateDetector()
+    return BloomDuplicateDetector(capacity=max(expected_captures, 10_000))
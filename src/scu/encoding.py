@@ -0,0 +1,36 @@
+"""Image encoding for raw captured frames."""
+
+from __future__ import annotations
+
+import io
+from functools import lru_cache
+
+from .config import ImageFormat
+from .interfaces import RawImage
+
+
+@lru_cache(maxsize=None)
+def _pil_image():
+    # Pillow is imported on the first encode so importing scu (e.g. for the CLI or tests)
+    # does not pay for loading it.
+    try:
+        from PIL import Image  # type: ignore
+    except ImportError as exc:  # pragma: no cover - pillow is optional
+        raise RuntimeError("Pillow is required to encode captures. Install the 'gui' extra first.") from exc
+    return Image
+
+
+def encode_image(image: RawImage, image_format: ImageFormat, jpeg_quality: int = 90) -> bytes:
+    """Encode raw 32-bit BGRX pixels into PNG or JPEG bytes."""
+
+    Image = _pil_image()
+    # The fourth byte of 32-bit BI_RGB pixels carries no alpha (the capture zeroes it), so
+    # unpack it as padding ("BGRX") straight into RGB: one pass, no alpha channel to
+    # compress and no JPEG convert.
+    pil_image = Image.frombuffer("RGB", (image.width, image.height), image.pixels, "raw", "BGRX", 0, 1)
+    with io.BytesIO() as stream:
+        if image_format is ImageFormat.JPG:
+            pil_image.save(stream, format="JPEG", quality=jpeg_quality)
+        else:
+            pil_image.save(stream, format="PNG")
+        return stream.getvalue()
@@ -6,7 +6,7 @@ from pathlib import Path
 from typing import Optional
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ProgressEvent:
     timestamp: datetime
     step_index: int
@@ -15,20 +15,20 @@ class ProgressEvent:
     message: str = ""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class WarningEvent:
     timestamp: datetime
     message: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ErrorEvent:
     timestamp: datetime
     message: str
     recoverable: bool = False
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class StateChangeEvent:
     timestamp: datetime
     state: str
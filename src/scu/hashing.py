@@ -0,0 +1,73 @@
+"""Fingerprints for captured frames used by duplicate and change detection."""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterator, List, Optional
+
+from .interfaces import RawImage
+
+try:  # pragma: no cover - optional accelerated hash, falls back to hashlib
+    from blake3 import blake3 as _hasher  # type: ignore
+except ImportError:  # pragma: no cover - blake3 is optional
+    from hashlib import sha1 as _hasher
+
+# Copying a pre-initialised state is cheaper than constructing a new hasher per frame.
+_BASE_HASHER = _hasher()
+# Raw captures are fingerprinted per band of rows so change detection can stop at the first difference.
+BAND_ROWS = 64
+# Frames at least this large have their bands hashed on a thread pool; both hashers release the GIL.
+_PARALLEL_HASH_MIN_BYTES = 1 << 22
+
+
+@lru_cache(maxsize=None)
+def _band_executor() -> Optional[ThreadPoolExecutor]:
+    workers = os.cpu_count() or 1
+    if workers < 2:
+        return None
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scu-band-hash")
+
+
+def hash_bytes(data: bytes | memoryview) -> bytes:
+    """Return the raw digest of ``data``."""
+
+    hasher = _BASE_HASHER.copy()
+    hasher.update(data)
+    return hasher.digest()
+
+
+def band_digests(image: RawImage) -> Iterator[bytes]:
+    """Yield a digest per band of rows, top to bottom, without copying the pixels."""
+
+    pixels = memoryview(image.pixels)
+    band_size = max(1, image.width * 4 * BAND_ROWS)
+    for start in range(0, len(pixels), band_size):
+        yield hash_bytes(pixels[start : start + band_size])
+
+
+def collect_band_digests(image: RawImage) -> List[bytes]:
+    """Digest every band, spreading large frames across CPU cores."""
+
+    pixels = memoryview(image.pixels)
+    executor = _band_executor() if pixels.nbytes >= _PARALLEL_HASH_MIN_BYTES else None
+    if executor is None:
+        return list(band_digests(image))
+    band_size = image.width * 4 * BAND_ROWS
+    bands = [pixels[start : start + band_size] for start in range(0, len(pixels), band_size)]
+    return list(executor.map(hash_bytes, bands))
+
+
+def combine_band_digests(bands: List[bytes]) -> bytes:
+    """Fold per-band digests into the frame's fingerprint."""
+
+    return hash_bytes(b"".join(bands))
+
+
+def hash_image(image: bytes | RawImage) -> bytes:
+    """Fingerprint a capture; raw captures hash their pixel bands, not an encoding."""
+
+    if isinstance(image, RawImage):
+        return combine_band_digests(collect_band_digests(image))
+    return hash_bytes(image)
@@ -7,19 +7,33 @@ from typing import Protocol
 from .config import CaptureMode, Direction, ImageFormat
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CaptureRequest:
     monitor: int
     capture_mode: CaptureMode
     min_overlap: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
+class RawImage:
+    """Top-down 32-bit BGRX pixels (fourth byte zero) that have not been encoded yet."""
+
+    pixels: bytes | memoryview
+    width: int
+    height: int
+
+    def __bool__(self) -> bool:
+        return self.width > 0 and self.height > 0
+
+
+@dataclass(frozen=True, slots=True)
 class CaptureResult:
-    image_bytes: bytes
+    # Either an encoded image or raw pixels that the output writer encodes on save.
+    image_bytes: bytes | RawImage
     width: int
     height: int
-    hash_value: str | None = None
+    # Services should fill this with scu.hashing.hash_image so every backend shares one hash space.
+    hash_value: bytes | None = None
 
 
 class CaptureService(Protocol):
@@ -36,17 +50,23 @@ class WaitService(Protocol):
     def wait_fixed(self, delay_seconds: float) -> None:
         """Sleep for a fixed amount of time."""
 
-    def wait_for_change(self, previous_hash: str | None, timeout_seconds: float) -> bool:
+    def arm(self) -> None:
+        """Start collecting change signals; called right before the step sends its key."""
+
+    def wait_for_change(self, previous_hash: bytes | None, timeout_seconds: float) -> bool:
         """Return True if a visual change is detected within timeout."""
 
 
 class DuplicateDetector(Protocol):
-    def is_duplicate(self, hash_value: str) -> bool:
+    def is_duplicate(self, hash_value: bytes) -> bool:
         """Return True if the hash has been seen before in the session."""
 
-    def remember(self, hash_value: str) -> None:
+    def remember(self, hash_value: bytes) -> None:
         """Record the hash as seen."""
 
+    def observe(self, hash_value: bytes) -> bool:
+        """Record the hash and return whether it had been seen before."""
+
 
 class OutputWriter(Protocol):
     def write_capture(
@@ -54,7 +74,7 @@ class OutputWriter(Protocol):
         session_dir: Path,
         index: int,
         image_format: ImageFormat,
-        image_bytes: bytes,
+        image_bytes: bytes | RawImage,
         jpeg_quality: int,
     ) -> Path:
-        """Persist the capture bytes to disk and return the path."""
+        """Persist the capture (encoding raw pixels if needed) and return the path."""
@@ -1,12 +1,35 @@
 from __future__ import annotations
 
-import hashlib
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Set
 
 from .config import AppConfig, ImageFormat
-from .interfaces import OutputWriter
+from .encoding import encode_image
+from .hashing import hash_bytes
+from .interfaces import OutputWriter, RawImage
+
+_CAPTURE_NAME_TEMPLATES = {image_format: "page_{:04d}" + image_format.extension for image_format in ImageFormat}
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0) | getattr(os, "O_CLOEXEC", 0)
+
+
+def _write_file(path: Path, data: bytes) -> None:
+    fd = os.open(path, _WRITE_FLAGS, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+
+def _persist(path: Path, image: bytes | RawImage, image_format: ImageFormat, jpeg_quality: int) -> None:
+    data = encode_image(image, image_format, jpeg_quality) if isinstance(image, RawImage) else image
+    _write_file(path, data)
 
 
 class SessionPathManager:
@@ -32,30 +55,126 @@ class SessionPathManager:
     def capture_path(self, index: int, image_format: ImageFormat) -> Path:
         if self.session_dir is None:
             raise RuntimeError("Session directory not prepared")
-        return self.session_dir / f"page_{index:04d}{image_format.extension}"
+        return self.session_dir / _CAPTURE_NAME_TEMPLATES[image_format].format(index)
 
-    def write_capture(self, index: int, image_format: ImageFormat, image_bytes: bytes, jpeg_quality: int = 90) -> Path:
+    def write_capture(
+        self,
+        index: int,
+        image_format: ImageFormat,
+        image_bytes: bytes | RawImage,
+        jpeg_quality: int = 90,
+    ) -> Path:
         path = self.capture_path(index, image_format)
-        path.write_bytes(image_bytes)
+        _persist(path, image_bytes, image_format, jpeg_quality)
         return path
 
     @staticmethod
-    def hash_bytes(data: bytes) -> str:
-        return hashlib.sha1(data).hexdigest()
+    def hash_bytes(data: bytes | memoryview) -> bytes:
+        return hash_bytes(data)
 
 
 class FilesystemOutputWriter(OutputWriter):
     """Persist captures to disk within the prepared session directory."""
 
+    def __init__(self) -> None:
+        self._prepared: Set[Path] = set()
+
     def write_capture(
         self,
         session_dir: Path,
         index: int,
         image_format: ImageFormat,
-        image_bytes: bytes,
+        image_bytes: bytes | RawImage,
         jpeg_quality: int,
     ) -> Path:
-        session_dir.mkdir(parents=True, exist_ok=True)
-        path = session_dir / f"page_{index:04d}{image_format.extension}"
-        path.write_bytes(image_bytes)
+        if session_dir not in self._prepared:
+            session_dir.mkdir(parents=True, exist_ok=True)
+            self._prepared.add(session_dir)
+        path = session_dir / _CAPTURE_NAME_TEMPLATES[image_format].format(index)
+        self._store(path, image_bytes, image_format, jpeg_quality)
         return path
+
+    def _store(self, path: Path, image: bytes | RawImage, image_format: ImageFormat, jpeg_quality: int) -> None:
+        _persist(path, image, image_format, jpeg_quality)
+
+
+class BackgroundOutputWriter(FilesystemOutputWriter):
+    """Filesystem writer that encodes and writes captures on a thread pool.
+
+    ``write_capture`` returns as soon as the capture is submitted, so encoding
+    and disk latency overlap with the next pipeline step. At most
+    ``max_pending`` captures are in flight to cap memory held by queued frames;
+    errors from the workers are re-raised on the next call to
+    ``write_capture``, ``flush`` or ``close``.
+    """
+
+    def __init__(self, max_pending: int = 8, max_workers: Optional[int] = None) -> None:
+        super().__init__()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or os.cpu_count() or 1,
+            thread_name_prefix="scu-output-writer",
+        )
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self._pending: Set[Future[None]] = set()
+        self._lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+        self._closed = False
+
+    def write_capture(
+        self,
+        session_dir: Path,
+        index: int,
+        image_format: ImageFormat,
+        image_bytes: bytes | RawImage,
+        jpeg_quality: int,
+    ) -> Path:
+        if self._closed:
+            raise RuntimeError("Output writer is closed")
+        self._raise_pending_error()
+        return super().write_capture(session_dir, index, image_format, image_bytes, jpeg_quality)
+
+    def flush(self) -> None:
+        """Block until every submitted capture has been written."""
+
+        with self._lock:
+            pending = list(self._pending)
+        wait(pending)
+        self._raise_pending_error()
+
+    def close(self) -> None:
+        """Write any pending captures and stop the worker threads."""
+
+        if not self._closed:
+            self._closed = True
+            self._executor.shutdown(wait=True)
+        self._raise_pending_error()
+
+    def __enter__(self) -> "BackgroundOutputWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _store(self, path: Path, image: bytes | RawImage, image_format: ImageFormat, jpeg_quality: int) -> None:
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(_persist, path, image, image_format, jpeg_quality)
+        except BaseException:
+            self._slots.release()
+            raise
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._on_done)
+
+    def _on_done(self, future: Future[None]) -> None:
+        with self._lock:
+            self._pending.discard(future)
+        self._slots.release()
+        error = future.exception()
+        if error is not None and self._error is None:
+            self._error = error
+
+    def _raise_pending_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
@@ -3,19 +3,19 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, List, Optional
 
 from .config import AppConfig, ProcessOrder, WaitMode
 from .events import WarningEvent
 from .interfaces import (
     CaptureRequest,
     CaptureService,
-    CaptureResult,
     DuplicateDetector,
     InputService,
     OutputWriter,
     WaitService,
 )
+from .hashing import hash_image
 from .output import SessionPathManager
 
 
@@ -23,7 +23,7 @@ from .output import SessionPathManager
 class StepOutcome:
     index: int
     image_path: Optional[Path]
-    hash_value: Optional[str]
+    hash_value: Optional[bytes]
     warnings: List[WarningEvent]
 
 
@@ -32,7 +32,11 @@ class SessionContext:
     config: AppConfig
     path_manager: SessionPathManager
     duplicate_detector: DuplicateDetector
-    last_hash: Optional[str] = None
+    last_hash: Optional[bytes] = None
+
+
+# A compiled step mutates the outcome in place; the timestamp is shared by its warnings.
+PipelineStep = Callable[[SessionContext, StepOutcome, datetime], None]
 
 
 class Pipeline:
@@ -49,62 +53,97 @@ class Pipeline:
         self.input_service = input_service
         self.wait_service = wait_service
         self.output_writer = output_writer
+        self._compiled_config: Optional[AppConfig] = None
+        self._steps: List[PipelineStep] = []
+        self._request: Optional[CaptureRequest] = None
 
-    def execute_step(self, context: SessionContext, index: int) -> StepOutcome:
-        config = context.config
-        warnings: List[WarningEvent] = []
+    def compile(self, config: AppConfig) -> None:
+        """Resolve the per-session step order once instead of branching on every step."""
 
-        if config.process_order == ProcessOrder.KEY_FIRST:
-            self.input_service.send_direction(config.direction)
+        # Config values and bound service methods are captured as closure cells, so the
+        # per-step code reads locals instead of walking config/service attributes.
+        send_direction = self.input_service.send_direction
+        direction = config.direction
 
-        capture_result = self._perform_capture(context)
-        image_path_obj: Optional[Path] = None
-        hash_value = capture_result.hash_value
+        if config.wait_mode == WaitMode.FIXED:
 
-        if capture_result.image_bytes:
-            if hash_value is None:
-                hash_value = context.path_manager.hash_bytes(capture_result.image_bytes)
-            image_path = self.output_writer.write_capture(
-                session_dir=context.path_manager.session_dir or context.path_manager.prepare_session_dir(),
-                index=index,
-                image_format=config.image_format,
-                image_bytes=capture_result.image_bytes,
-                jpeg_quality=config.jpeg_quality,
-            )
-            image_path_obj = image_path
-
-            if hash_value:
-                if context.duplicate_detector.is_duplicate(hash_value):
-                    warnings.append(
-                        WarningEvent(
-                            timestamp=datetime.now(),
-                            message="Duplicate frame detected",
-                        )
-                    )
-                context.duplicate_detector.remember(hash_value)
-                context.last_hash = hash_value
+            def send_key(context: SessionContext, outcome: StepOutcome, emit_time: datetime) -> None:
+                send_direction(direction)
 
-        if config.process_order == ProcessOrder.SHOT_FIRST:
-            self.input_service.send_direction(config.direction)
+        else:
+            # Arm before the key goes out so repaints it triggers during the capture still count.
+            arm = self.wait_service.arm
+
+            def send_key(context: SessionContext, outcome: StepOutcome, emit_time: datetime) -> None:
+                arm()
+                send_direction(direction)
 
+        steps: List[PipelineStep] = []
+        if config.process_order == ProcessOrder.KEY_FIRST:
+            steps.append(send_key)
+        steps.append(self._capture_and_write)
+        if config.process_order == ProcessOrder.SHOT_FIRST:
+            steps.append(send_key)
         if config.wait_mode == WaitMode.FIXED:
-            self.wait_service.wait_fixed(config.delay)
+            wait_fixed = self.wait_service.wait_fixed
+            delay = config.delay
+
+            def wait(context: SessionContext, outcome: StepOutcome, emit_time: datetime) -> None:
+                wait_fixed(delay)
+
         else:
-            changed = self.wait_service.wait_for_change(context.last_hash, config.wait_timeout or 0.0)
-            if not changed:
-                warnings.append(
-                    WarningEvent(
-                        timestamp=datetime.now(),
-                        message="No visual change detected before timeout",
+            wait_for_change = self.wait_service.wait_for_change
+            timeout = config.wait_timeout or 0.0
+
+            def wait(context: SessionContext, outcome: StepOutcome, emit_time: datetime) -> None:
+                if not wait_for_change(context.last_hash, timeout):
+                    outcome.warnings.append(
+                        WarningEvent(timestamp=emit_time, message="No visual change detected before timeout")
                     )
-                )
 
-        return StepOutcome(index=index, image_path=image_path_obj, hash_value=hash_value, warnings=warnings)
+        steps.append(wait)
+        self._steps = steps
+        self._request = CaptureRequest(
+            monitor=config.monitor,
+            capture_mode=config.capture_mode,
+            min_overlap=config.min_overlap,
+        )
+        self._compiled_config = config
 
-    def _perform_capture(self, context: SessionContext) -> CaptureResult:
-        request = CaptureRequest(
-            monitor=context.config.monitor,
-            capture_mode=context.config.capture_mode,
-            min_overlap=context.config.min_overlap,
+    def execute_step(self, context: SessionContext, index: int) -> StepOutcome:
+        # AppConfig is frozen, so identity is enough to tell whether the compiled steps still apply.
+        if context.config is not self._compiled_config:
+            self.compile(context.config)
+        outcome = StepOutcome(index=index, image_path=None, hash_value=None, warnings=[])
+        # One timestamp covers every warning raised during this step.
+        emit_time = datetime.now()
+        for step in self._steps:
+            step(context, outcome, emit_time)
+        return outcome
+
+    def _capture_and_write(self, context: SessionContext, outcome: StepOutcome, emit_time: datetime) -> None:
+        capture_result = self.capture_service.capture(self._request)
+        hash_value = capture_result.hash_value
+        image = capture_result.image_bytes
+        if not image:
+            outcome.hash_value = hash_value
+            return
+
+        config = context.config
+        path_manager = context.path_manager
+        if hash_value is None:
+            # Capture services normally supply the hash; this keeps third-party backends working.
+            hash_value = hash_image(image)
+        outcome.hash_value = hash_value
+        outcome.image_path = self.output_writer.write_capture(
+            session_dir=path_manager.session_dir or path_manager.prepare_session_dir(),
+            index=outcome.index,
+            image_format=config.image_format,
+            image_bytes=image,
+            jpeg_quality=config.jpeg_quality,
         )
-        return self.capture_service.capture(request)
+
+        if hash_value:
+            if context.duplicate_detector.observe(hash_value):
+                outcome.warnings.append(WarningEvent(timestamp=emit_time, message="Duplicate frame detected"))
+            context.last_hash = hash_value
@@ -5,6 +5,7 @@ from .windows import (
     Win32CaptureService,
     Win32InputService,
     Win32WaitService,
+    WinEventChangeNotifier,
 )
 
 __all__ = [
@@ -12,4 +13,5 @@ __all__ = [
     "Win32CaptureService",
     "Win32InputService",
     "Win32WaitService",
+    "WinEventChangeNotifier",
 ]
@@ -3,23 +3,18 @@
 from __future__ import annotations
 
 import ctypes
-import hashlib
-import io
 import sys
+import threading
 import time
-from dataclasses import dataclass
-from typing import Callable, Optional, Protocol, Sequence
+from dataclasses import dataclass, field, replace
+from typing import Callable, List, Optional, Protocol, Sequence, Tuple
 
 from ..config import CaptureMode, Direction
-from ..interfaces import CaptureRequest, CaptureResult, CaptureService, InputService, WaitService
+from ..interfaces import CaptureRequest, CaptureResult, CaptureService, InputService, RawImage, WaitService
+from ..hashing import band_digests, collect_band_digests, combine_band_digests, hash_image
 
-try:  # pragma: no cover - optional dependency used only on Windows at runtime
-    from PIL import Image  # type: ignore
-except Exception:  # pragma: no cover - pillow is optional
-    Image = None  # type: ignore
 
-
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Rect:
     """Simple rectangle utility."""
 
@@ -27,18 +22,17 @@ class Rect:
     top: int
     right: int
     bottom: int
-
-    @property
-    def width(self) -> int:
-        return max(0, self.right - self.left)
-
-    @property
-    def height(self) -> int:
-        return max(0, self.bottom - self.top)
-
-    @property
-    def area(self) -> int:
-        return self.width * self.height
+    # Derived once at construction; the capture path reads these on every step.
+    width: int = field(init=False, repr=False, compare=False)
+    height: int = field(init=False, repr=False, compare=False)
+    area: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        width = max(0, self.right - self.left)
+        height = max(0, self.bottom - self.top)
+        object.__setattr__(self, "width", width)
+        object.__setattr__(self, "height", height)
+        object.__setattr__(self, "area", width * height)
 
     def intersect(self, other: "Rect") -> "Rect":
         return Rect(
@@ -57,10 +51,10 @@ class Rect:
         )
 
     def overlap_ratio(self, other: "Rect") -> float:
-        if self.area == 0:
+        area = self.area
+        if area == 0:
             return 0.0
-        intersection = self.intersect(other)
-        return intersection.area / self.area
+        return self.intersect(other).area / area
 
 
 class Win32API(Protocol):
@@ -72,7 +66,7 @@ class Win32API(Protocol):
     def get_foreground_window_rect(self) -> Rect | None:
         ...
 
-    def capture_rect(self, rect: Rect) -> bytes:
+    def capture_rect(self, rect: Rect) -> CaptureResult:
         ...
 
     def send_key(self, vk_code: int) -> None:
@@ -86,11 +80,86 @@ class Win32CaptureService(CaptureService):
         if api is None and sys.platform != "win32":  # pragma: no cover - requires Windows
             raise RuntimeError("Win32CaptureService can only be used on Windows")
         self.api = api or RealWin32API()  # type: ignore[arg-type]
+        self._monitors_cache: Optional[Sequence[Rect]] = None
+        # Band digests of the last raw capture; detect_change compares new frames against them.
+        self._last_request: Optional[CaptureRequest] = None
+        self._last_rect: Optional[Rect] = None
+        self._reference: Optional[Tuple[int, int, List[bytes], bytes]] = None
+
+    def invalidate_monitors(self) -> None:
+        """Forget the cached monitor layout and GDI handles, e.g. after a display change.
+
+        Safe to call from another thread: the handles are released by the next
+        capture, on the capturing thread, before the layout is re-enumerated.
+        """
+
+        self._monitors_cache = None
+
+    def close(self) -> None:
+        """Release resources cached by the underlying API, if it holds any."""
+
+        close = getattr(self.api, "close", None)
+        if close is not None:
+            close()
+
+    def _monitors(self, refresh: bool = False) -> Sequence[Rect]:
+        monitors = self._monitors_cache
+        if monitors is None or refresh:
+            # A topology or DPI change also invalidates the cached screen DC and bitmap.
+            self.close()
+            monitors = self._monitors_cache = list(self.api.list_monitors())
+        return monitors
 
     def capture(self, request: CaptureRequest) -> CaptureResult:
-        monitors = list(self.api.list_monitors())
-        if request.monitor < 1 or request.monitor > len(monitors):
-            raise ValueError(f"Monitor {request.monitor} is not available")
+        rect = self._target_rect(request)
+        result = self.api.capture_rect(rect)
+        self._last_request = request
+        self._last_rect = rect
+        image = result.image_bytes
+        if isinstance(image, RawImage) and image:
+            # Hash raw frames here so the band digests can be kept for change detection.
+            bands = collect_band_digests(image)
+            hash_value = combine_band_digests(bands)
+            self._reference = (image.width, image.height, bands, hash_value)
+            return replace(result, hash_value=hash_value)
+        self._reference = None
+        return result
+
+    def detect_change(self) -> bytes | None:
+        """Fingerprint the current target for :class:`Win32WaitService` polling.
+
+        Returns the last capture's hash while the screen is unchanged and stops
+        hashing at the first band that differs otherwise. Returns None before
+        the first capture. If the target cannot be resolved mid-wait (e.g. no
+        foreground window for a moment), the last captured rect is fingerprinted.
+        """
+
+        request, rect = self._last_request, self._last_rect
+        if request is None or rect is None:
+            return None
+        try:
+            rect = self._target_rect(request)
+        except (RuntimeError, ValueError):
+            pass
+        image = self.api.capture_rect(rect).image_bytes
+        reference = self._reference
+        if not isinstance(image, RawImage) or reference is None:
+            return hash_image(image)
+        width, height, bands, hash_value = reference
+        if (image.width, image.height) != (width, height):
+            return hash_image(image)
+        for digest, expected in zip(band_digests(image), bands):
+            if digest != expected:
+                return digest
+        return hash_value
+
+    def _target_rect(self, request: CaptureRequest) -> Rect:
+        monitors = self._monitors()
+        if not 1 <= request.monitor <= len(monitors):
+            # The layout may have changed since it was cached; re-enumerate before failing.
+            monitors = self._monitors(refresh=True)
+            if not 1 <= request.monitor <= len(monitors):
+                raise ValueError(f"Monitor {request.monitor} is not available")
         monitor_rect = monitors[request.monitor - 1]
 
         if request.capture_mode is CaptureMode.FULL_MONITOR:
@@ -105,15 +174,7 @@ class Win32CaptureService(CaptureService):
 
         if target_rect.area == 0:
             raise RuntimeError("Target capture area is empty")
-
-        image_bytes = self.api.capture_rect(target_rect)
-        hash_value = hashlib.sha1(image_bytes).hexdigest() if image_bytes else None
-        return CaptureResult(
-            image_bytes=image_bytes,
-            width=target_rect.width,
-            height=target_rect.height,
-            hash_value=hash_value,
-        )
+        return target_rect
 
 
 class Win32InputService(InputService):
@@ -133,16 +194,24 @@ class Win32InputService(InputService):
 
 
 class Win32WaitService(WaitService):
-    """Wait service supporting both fixed delay and change detection polling."""
+    """Wait service supporting fixed delays and change detection.
+
+    Change detection blocks on ``change_event`` when one is supplied (for
+    example by :class:`WinEventChangeNotifier`) and otherwise polls
+    ``change_detector``. With both, the first event starts polling the
+    detector until its fingerprint differs from the previous capture's hash.
+    """
 
     def __init__(
         self,
-        change_detector: Optional[Callable[[], str | None]] = None,
+        change_detector: Optional[Callable[[], bytes | None]] = None,
         poll_interval: float = 0.1,
         sleep_fn: Callable[[float], None] | None = None,
         monotonic_fn: Callable[[], float] | None = None,
+        change_event: Optional[threading.Event] = None,
     ) -> None:
         self._change_detector = change_detector
+        self._change_event = change_event
         self._poll_interval = max(0.01, poll_interval)
         self._sleep = sleep_fn or time.sleep
         self._monotonic = monotonic_fn or time.monotonic
@@ -151,9 +220,16 @@ class Win32WaitService(WaitService):
         if delay_seconds > 0:
             self._sleep(delay_seconds)
 
-    def wait_for_change(self, previous_hash: str | None, timeout_seconds: float) -> bool:
+    def arm(self) -> None:
+        # Drop signals left over from earlier steps; anything after this belongs to the new key.
+        if self._change_event is not None:
+            self._change_event.clear()
+
+    def wait_for_change(self, previous_hash: bytes | None, timeout_seconds: float) -> bool:
         if timeout_seconds <= 0:
             return True
+        if self._change_event is not None:
+            return self._wait_for_event(self._change_event, previous_hash, timeout_seconds)
         if self._change_detector is None:
             self._sleep(timeout_seconds)
             return True
@@ -169,6 +245,29 @@ class Win32WaitService(WaitService):
             self._sleep(min(self._poll_interval, remaining))
         return False
 
+    def _wait_for_event(
+        self,
+        change_event: threading.Event,
+        previous_hash: bytes | None,
+        timeout_seconds: float,
+    ) -> bool:
+        deadline = self._monotonic() + timeout_seconds
+        if not change_event.wait(max(0.0, deadline - self._monotonic())):
+            return False
+        change_event.clear()
+        if self._change_detector is None or previous_hash is None:
+            return True
+        # WinEvents usually fire before the repaint, and the repaint itself raises none, so
+        # after the first event only the pixels are consulted until they differ or time runs out.
+        while True:
+            current_hash = self._change_detector()
+            if current_hash is None or current_hash != previous_hash:
+                return True
+            remaining = deadline - self._monotonic()
+            if remaining <= 0:
+                return False
+            self._sleep(min(self._poll_interval, remaining))
+
 
 class Win32Error(RuntimeError):
     """Raised when a Win32 API call fails."""
@@ -182,6 +281,15 @@ if sys.platform == "win32":  # pragma: no cover - real API only exercised on Win
     BI_RGB = 0
     INPUT_KEYBOARD = 1
     KEYEVENTF_KEYUP = 0x0002
+    WINEVENT_OUTOFCONTEXT = 0x0000
+    WINEVENT_SKIPOWNPROCESS = 0x0002
+    EVENT_OBJECT_SHOW = 0x8002
+    EVENT_OBJECT_VALUECHANGE = 0x800E
+    OBJID_CARET = -8
+    OBJID_CURSOR = -9
+    GA_ROOT = 2
+    PM_NOREMOVE = 0x0000
+    WM_QUIT = 0x0012
 
     class _RECT(ctypes.Structure):
         _fields_ = [
@@ -227,6 +335,16 @@ if sys.platform == "win32":  # pragma: no cover - real API only exercised on Win
     class INPUT(ctypes.Structure):
         _fields_ = [("type", wintypes.DWORD), ("union", _INPUTUNION)]
 
+    _INPUT_SIZE = ctypes.sizeof(INPUT)
+
+    def _key_press_inputs(vk_code: int) -> ctypes.Array:
+        inputs = (INPUT * 2)()
+        inputs[0].type = INPUT_KEYBOARD
+        inputs[0].union.ki = KEYBDINPUT(wVk=vk_code, wScan=0, dwFlags=0, time=0, dwExtraInfo=0)
+        inputs[1].type = INPUT_KEYBOARD
+        inputs[1].union.ki = KEYBDINPUT(wVk=vk_code, wScan=0, dwFlags=KEYEVENTF_KEYUP, time=0, dwExtraInfo=0)
+        return inputs
+
     MonitorEnumProc = ctypes.WINFUNCTYPE(
         wintypes.BOOL,
         wintypes.HMONITOR,
@@ -235,11 +353,100 @@ if sys.platform == "win32":  # pragma: no cover - real API only exercised on Win
         wintypes.LPARAM,
     )
 
+    WinEventProc = ctypes.WINFUNCTYPE(
+        None,
+        wintypes.HANDLE,
+        wintypes.DWORD,
+        wintypes.HWND,
+        wintypes.LONG,
+        wintypes.LONG,
+        wintypes.DWORD,
+        wintypes.DWORD,
+    )
+
+    class WinEventChangeNotifier:
+        """Sets ``event`` whenever Windows reports a UI change in the foreground window."""
+
+        def __init__(self, event: Optional[threading.Event] = None) -> None:
+            self.event = event or threading.Event()
+            self._user32 = ctypes.windll.user32
+            self._kernel32 = ctypes.windll.kernel32
+            self._user32.SetWinEventHook.restype = wintypes.HANDLE
+            self._user32.GetAncestor.restype = wintypes.HWND
+            self._user32.GetForegroundWindow.restype = wintypes.HWND
+            self._callback = WinEventProc(self._on_win_event)
+            self._thread: Optional[threading.Thread] = None
+            self._thread_id = 0
+            self._ready = threading.Event()
+            self._hooked = False
+
+        def start(self) -> None:
+            if self._thread is not None:
+                return
+            self._ready.clear()
+            self._thread = threading.Thread(target=self._run, name="scu-win-events", daemon=True)
+            self._thread.start()
+            self._ready.wait()
+            if not self._hooked:
+                # Without the hook every wait would time out and look like "no visual change".
+                self._thread.join()
+                self._thread = None
+                raise Win32Error("SetWinEventHook failed")
+
+        def stop(self) -> None:
+            if self._thread is None:
+                return
+            self._user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            self._thread.join()
+            self._thread = None
+
+        def _run(self) -> None:
+            # Out-of-context hooks deliver callbacks through this thread's message queue.
+            msg = wintypes.MSG()
+            self._thread_id = self._kernel32.GetCurrentThreadId()
+            self._user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, PM_NOREMOVE)  # create the queue
+            hook = self._user32.SetWinEventHook(
+                EVENT_OBJECT_SHOW,
+                EVENT_OBJECT_VALUECHANGE,
+                None,
+                self._callback,
+                0,
+                0,
+                WINEVENT_OUTOFCONTEXT | WINEVENT_SKIPOWNPROCESS,
+            )
+            self._hooked = bool(hook)
+            self._ready.set()
+            if not hook:
+                return
+            try:
+                while self._user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                    self._user32.TranslateMessage(ctypes.byref(msg))
+                    self._user32.DispatchMessageW(ctypes.byref(msg))
+            finally:
+                self._user32.UnhookWinEvent(hook)
+
+        def _on_win_event(self, hook, event_id, hwnd, id_object, id_child, thread_id, timestamp) -> None:  # noqa: ANN001
+            if not hwnd or id_object in (OBJID_CURSOR, OBJID_CARET):
+                return
+            if self._user32.GetAncestor(hwnd, GA_ROOT) == self._user32.GetForegroundWindow():
+                self.event.set()
+
     class RealWin32API:
         def __init__(self) -> None:
             self.user32 = ctypes.windll.user32
             self.gdi32 = ctypes.windll.gdi32
             self.user32.SetProcessDPIAware()
+            self._hdc_screen = None
+            self._hdc_mem = None
+            self._bitmap = None
+            self._bitmap_size = (0, 0)
+            self._bmi: Optional[BITMAPINFO] = None
+            self._padding = b""
+            # Key-down/key-up pairs are immutable, so build them once and resubmit on every step.
+            self._key_inputs: dict[int, ctypes.Array] = {
+                vk_code: _key_press_inputs(vk_code)
+                for vk_code in (Win32InputService.VK_LEFT, Win32InputService.VK_RIGHT)
+            }
 
         def list_monitors(self) -> Sequence[Rect]:
             monitors: list[Rect] = []
@@ -264,74 +471,119 @@ if sys.platform == "win32":  # pragma: no cover - real API only exercised on Win
                 raise Win32Error("GetWindowRect failed")
             return Rect(rect.left, rect.top, rect.right, rect.bottom)
 
-        def capture_rect(self, rect: Rect) -> bytes:
+        def capture_rect(self, rect: Rect) -> CaptureResult:
             width, height = rect.width, rect.height
             if width == 0 or height == 0:
-                return b""
-
-            hdc_screen = self.user32.GetDC(0)
-            if not hdc_screen:
-                raise Win32Error("GetDC failed")
-            hdc_mem = self.gdi32.CreateCompatibleDC(hdc_screen)
-            if not hdc_mem:
-                self.user32.ReleaseDC(0, hdc_screen)
-                raise Win32Error("CreateCompatibleDC failed")
-            bitmap = self.gdi32.CreateCompatibleBitmap(hdc_screen, width, height)
+                return CaptureResult(image_bytes=b"", width=width, height=height)
+
+            self._prepare_bitmap(width, height)
+            if not self.gdi32.BitBlt(self._hdc_mem, 0, 0, width, height, self._hdc_screen, rect.left, rect.top, SRCCOPY):
+                raise Win32Error("BitBlt failed")
+
+            # A fresh pixel buffer per frame: encoding happens later, after the next BitBlt.
+            size = width * height * 4
+            pixels = bytearray(size)
+            if not self.gdi32.GetDIBits(
+                self._hdc_mem,
+                self._bitmap,
+                0,
+                height,
+                (ctypes.c_ubyte * size).from_buffer(pixels),
+                ctypes.byref(self._bmi),
+                DIB_RGB_COLORS,
+            ):
+                raise Win32Error("GetDIBits failed")
+            # BI_RGB leaves the fourth byte of each pixel undefined; zero it so identical frames
+            # hash identically (duplicate detection and detect_change both fingerprint it).
+            pixels[3::4] = self._padding
+            # Encoding is deferred to the output writer so it can run off the capture thread;
+            # Win32CaptureService fingerprints the raw pixels.
+            return CaptureResult(
+                image_bytes=RawImage(pixels=memoryview(pixels), width=width, height=height),
+                width=width,
+                height=height,
+            )
+
+        def close(self) -> None:
+            """Release the cached GDI handles; they are recreated on the next capture."""
+
+            if self._hdc_mem:
+                self.gdi32.DeleteDC(self._hdc_mem)
+                self._hdc_mem = None
+            if self._bitmap:
+                self.gdi32.DeleteObject(self._bitmap)
+                self._bitmap = None
+                self._bitmap_size = (0, 0)
+            if self._hdc_screen:
+                self.user32.ReleaseDC(0, self._hdc_screen)
+                self._hdc_screen = None
+
+        def __del__(self) -> None:
+            try:
+                self.close()
+            except Exception:  # noqa: BLE001 - interpreter may be shutting down
+                pass
+
+        def _prepare_bitmap(self, width: int, height: int) -> None:
+            # The screen DC, memory DC and bitmap are reused while the capture size is unchanged.
+            if not self._hdc_screen:
+                hdc_screen = self.user32.GetDC(0)
+                if not hdc_screen:
+                    raise Win32Error("GetDC failed")
+                self._hdc_screen = hdc_screen
+            if not self._hdc_mem:
+                hdc_mem = self.gdi32.CreateCompatibleDC(self._hdc_screen)
+                if not hdc_mem:
+                    raise Win32Error("CreateCompatibleDC failed")
+                self._hdc_mem = hdc_mem
+                self._bitmap_size = (0, 0)
+            if self._bitmap and self._bitmap_size == (width, height):
+                return
+
+            bitmap = self.gdi32.CreateCompatibleBitmap(self._hdc_screen, width, height)
             if not bitmap:
-                self.gdi32.DeleteDC(hdc_mem)
-                self.user32.ReleaseDC(0, hdc_screen)
                 raise Win32Error("CreateCompatibleBitmap failed")
-            try:
-                if not self.gdi32.SelectObject(hdc_mem, bitmap):
-                    raise Win32Error("SelectObject failed")
-                if not self.gdi32.BitBlt(hdc_mem, 0, 0, width, height, hdc_screen, rect.left, rect.top, SRCCOPY):
-                    raise Win32Error("BitBlt failed")
-
-                bmi = BITMAPINFO()
-                ctypes.memset(ctypes.byref(bmi), 0, ctypes.sizeof(bmi))
-                bmi.bmiHeader.biSize = ctypes.sizeof(BITMAPINFOHEADER)
-                bmi.bmiHeader.biWidth = width
-                bmi.bmiHeader.biHeight = -height  # top-down bitmap
-                bmi.bmiHeader.biPlanes = 1
-                bmi.bmiHeader.biBitCount = 32
-                bmi.bmiHeader.biCompression = BI_RGB
-
-                buffer_size = width * height * 4
-                buffer = (ctypes.c_ubyte * buffer_size)()
-                if not self.gdi32.GetDIBits(
-                    hdc_mem,
-                    bitmap,
-                    0,
-                    height,
-                    ctypes.byref(buffer),
-                    ctypes.byref(bmi),
-                    DIB_RGB_COLORS,
-                ):
-                    raise Win32Error("GetDIBits failed")
-                raw_bytes = bytes(buffer)
-                if Image is None:
-                    return raw_bytes
-                image = Image.frombuffer("RGBA", (width, height), raw_bytes, "raw", "BGRA", 0, 1)
-                with io.BytesIO() as stream:
-                    image.save(stream, format="PNG")
-                    return stream.getvalue()
-            finally:
+            if not self.gdi32.SelectObject(self._hdc_mem, bitmap):
                 self.gdi32.DeleteObject(bitmap)
-                self.gdi32.DeleteDC(hdc_mem)
-                self.user32.ReleaseDC(0, hdc_screen)
+                raise Win32Error("SelectObject failed")
+            if self._bitmap:
+                # Deselected by the SelectObject call above, so it can be freed now.
+                self.gdi32.DeleteObject(self._bitmap)
+            self._bitmap = bitmap
+            self._bitmap_size = (width, height)
+
+            bmi = BITMAPINFO()
+            ctypes.memset(ctypes.byref(bmi), 0, ctypes.sizeof(bmi))
+            bmi.bmiHeader.biSize = ctypes.sizeof(BITMAPINFOHEADER)
+            bmi.bmiHeader.biWidth = width
+            bmi.bmiHeader.biHeight = -height  # top-down bitmap
+            bmi.bmiHeader.biPlanes = 1
+            bmi.bmiHeader.biBitCount = 32
+            bmi.bmiHeader.biCompression = BI_RGB
+            self._bmi = bmi
+            # One zero per pixel, written over the undefined fourth byte after each GetDIBits.
+            self._padding = bytes(width * height)
 
         def send_key(self, vk_code: int) -> None:
-            inputs = (INPUT * 2)()
-            inputs[0].type = INPUT_KEYBOARD
-            inputs[0].union.ki = KEYBDINPUT(wVk=vk_code, wScan=0, dwFlags=0, time=0, dwExtraInfo=0)
-            inputs[1].type = INPUT_KEYBOARD
-            inputs[1].union.ki = KEYBDINPUT(wVk=vk_code, wScan=0, dwFlags=KEYEVENTF_KEYUP, time=0, dwExtraInfo=0)
-            sent = self.user32.SendInput(2, ctypes.byref(inputs), ctypes.sizeof(INPUT))
+            inputs = self._key_inputs.get(vk_code)
+            if inputs is None:
+                inputs = self._key_inputs[vk_code] = _key_press_inputs(vk_code)
+            sent = self.user32.SendInput(2, ctypes.byref(inputs), _INPUT_SIZE)
             if sent != 2:
                 raise Win32Error("SendInput failed")
 
 else:  # pragma: no cover - placeholder for non-Windows environments
 
+    class WinEventChangeNotifier:  # type: ignore[no-redef]
+        def __init__(self, event: Optional[threading.Event] = None) -> None:
+            raise RuntimeError("WinEventChangeNotifier is only available on Windows")
+
+        def start(self) -> None:
+            raise RuntimeError("WinEventChangeNotifier is only available on Windows")
+
+        def stop(self) -> None:
+            raise RuntimeError("WinEventChangeNotifier is only available on Windows")
+
     class RealWin32API:  # type: ignore[override]
         def __init__(self) -> None:
             raise RuntimeError("RealWin32API is only available on Windows")
@@ -342,7 +594,10 @@ else:  # pragma: no cover - placeholder for non-Windows environments
         def get_foreground_window_rect(self) -> Rect | None:
             raise RuntimeError("RealWin32API is only available on Windows")
 
-        def capture_rect(self, rect: Rect) -> bytes:
+        def capture_rect(self, rect: Rect) -> CaptureResult:
+            raise RuntimeError("RealWin32API is only available on Windows")
+
+        def close(self) -> None:
             raise RuntimeError("RealWin32API is only available on Windows")
 
         def send_key(self, vk_code: int) -> None:
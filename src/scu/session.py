@@ -7,7 +7,7 @@ from pathlib import Path
 from typing import Callable, Optional
 
 from .config import AppConfig, SessionMode
-from .duplicates import SimpleDuplicateDetector
+from .duplicates import create_duplicate_detector
 from .events import ErrorEvent, ProgressEvent, StateChangeEvent, WarningEvent
 from .output import SessionPathManager
 from .pipeline import Pipeline, SessionContext
@@ -44,8 +44,10 @@ class SessionController:
         self.state = SessionState.IDLE
         self.path_manager = SessionPathManager(config)
         self.runtime: Optional[SessionRuntime] = None
-        self.duplicate_detector = SimpleDuplicateDetector()
+        expected_captures = config.count if config.session_mode == SessionMode.FIXED_COUNT else None
+        self.duplicate_detector = create_duplicate_detector(expected_captures)
         self.time_limit_deadline: Optional[datetime] = None
+        self._context: Optional[SessionContext] = None
 
     def start(self, now: Optional[datetime] = None, session_name: Optional[str] = None) -> None:
         if self.state not in {SessionState.IDLE, SessionState.STOPPED}:
@@ -54,12 +56,18 @@ class SessionController:
         self.path_manager.prepare_session_dir(now=start_time, session_name=session_name)
         total_steps = self.config.count if self.config.session_mode == SessionMode.FIXED_COUNT else None
         self.runtime = SessionRuntime(start_time=start_time, total_steps=total_steps)
+        # Everything but last_hash is fixed for the session, so the context is built once here.
+        self._context = SessionContext(
+            config=self.config,
+            path_manager=self.path_manager,
+            duplicate_detector=self.duplicate_detector,
+        )
         self.state = SessionState.RUNNING
         if self.config.session_mode == SessionMode.TIME_LIMIT and self.config.time_limit_seconds:
             self.time_limit_deadline = start_time + timedelta(seconds=self.config.time_limit_seconds)
         else:
             self.time_limit_deadline = None
-        self._emit_state_change()
+        self._emit_state_change(start_time)
 
     def pause(self) -> None:
         if self.state != SessionState.RUNNING:
@@ -73,45 +81,41 @@ class SessionController:
         self.state = SessionState.RUNNING
         self._emit_state_change()
 
-    def stop(self) -> None:
+    def stop(self, now: Optional[datetime] = None) -> None:
         if self.state in {SessionState.STOPPED, SessionState.ERROR}:
             return
         self.state = SessionState.STOPPED
-        self._emit_state_change()
+        self._emit_state_change(now)
 
     def request_stop(self) -> None:
         if not self.runtime:
             return
         self.runtime.stop_requested = True
 
-    def step(self) -> None:
+    def step(self, now: Optional[datetime] = None) -> None:
         if self.state != SessionState.RUNNING:
             raise RuntimeError("Session is not running")
-        if not self.runtime:
+        if not self.runtime or not self._context:
             raise RuntimeError("Session not initialised")
 
         if self.runtime.stop_requested:
             self.stop()
             return
 
-        if self.time_limit_deadline and datetime.now() >= self.time_limit_deadline:
-            self.stop()
+        now = now or datetime.now()
+        if self.time_limit_deadline and now >= self.time_limit_deadline:
+            self.stop(now)
             return
 
         index = self.runtime.completed_steps + 1
-        context = SessionContext(
-            config=self.config,
-            path_manager=self.path_manager,
-            duplicate_detector=self.duplicate_detector,
-        )
         try:
-            outcome = self.pipeline.execute_step(context, index=index)
+            outcome = self.pipeline.execute_step(self._context, index=index)
         except Exception as exc:  # noqa: BLE001 - propagate domain errors
             self.state = SessionState.ERROR
-            self._emit_state_change()
+            self._emit_state_change(now)
             self.event_callback(
                 ErrorEvent(
-                    timestamp=datetime.now(),
+                    timestamp=now,
                     message=str(exc),
                     recoverable=False,
                 )
@@ -119,29 +123,29 @@ class SessionController:
             raise
 
         self.runtime.completed_steps += 1
-        self._emit_progress(outcome.image_path)
+        self._emit_progress(outcome.image_path, now)
         for warning in outcome.warnings:
             self.event_callback(warning)
 
         if self.runtime.total_steps and self.runtime.completed_steps >= self.runtime.total_steps:
-            self.stop()
+            self.stop(now)
 
-    def _emit_progress(self, image_path: Optional[Path]) -> None:
+    def _emit_progress(self, image_path: Optional[Path], now: datetime) -> None:
         if not self.runtime:
             return
         self.event_callback(
             ProgressEvent(
-                timestamp=datetime.now(),
+                timestamp=now,
                 step_index=self.runtime.completed_steps,
                 total_steps=self.runtime.total_steps,
                 image_path=image_path,
             )
         )
 
-    def _emit_state_change(self) -> None:
+    def _emit_state_change(self, now: Optional[datetime] = None) -> None:
         self.event_callback(
             StateChangeEvent(
-                timestamp=datetime.now(),
+                timestamp=now or datetime.now(),
                 state=self.state.value,
             )
         )
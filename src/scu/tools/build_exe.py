@@ -6,6 +6,9 @@ import argparse
 from pathlib import Path
 from typing import Sequence
 
+# Resolved once per process rather than on every build.
+_ENTRY_POINT = Path(__file__).resolve().parents[1] / "gui" / "main.py"
+
 
 def build_executable(
     dist_path: Path | None = None,
@@ -23,16 +26,15 @@ def build_executable(
             "PyInstaller is required to build the executable. Install the 'build' extra first."
         ) from exc
 
-    entry_point = Path(__file__).resolve().parents[1] / "gui" / "main.py"
-
-    args = ["--noconfirm", "--windowed", f"--name={name}"]
-    if clean:
-        args.append("--clean")
-    if onefile:
-        args.append("--onefile")
-    if dist_path is not None:
-        args.append(f"--distpath={Path(dist_path).resolve()}")
-    args.append(str(entry_point))
+    args = [
+        "--noconfirm",
+        "--windowed",
+        f"--name={name}",
+        *(["--clean"] if clean else []),
+        *(["--onefile"] if onefile else []),
+        *([f"--distpath={Path(dist_path).resolve()}"] if dist_path is not None else []),
+        str(_ENTRY_POINT),
+    ]
 
     pyinstaller_main.run(args)
 
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+import pytest
+
+from scu.config import AppConfig
+from scu.output import SessionPathManager
+
+
+@pytest.fixture(scope="session")
+def prepared_session(tmp_path_factory: pytest.TempPathFactory) -> Tuple[AppConfig, SessionPathManager]:
+    """A config and session directory prepared once for the whole test run."""
+
+    config = AppConfig(output_dir=tmp_path_factory.mktemp("scu"))
+    manager = SessionPathManager(config)
+    manager.prepare_session_dir(session_name="sess")
+    return config, manager
@@ -1,5 +1,7 @@
 from pathlib import Path
 
+import pytest
+
 from scu.config import AppConfig, CaptureMode, ConfigRepository, Direction, ProcessOrder, TemplateStore, WaitMode
 
 
@@ -38,3 +40,83 @@ def test_save_recent_overwrites(tmp_path: Path) -> None:
 
     loaded = repo.load_recent()
     assert loaded.monitor == 3
+
+
+def test_load_reuses_cache_until_file_changes(tmp_path: Path, monkeypatch) -> None:
+    repo_path = tmp_path / "cfg.json"
+    repo = ConfigRepository(path=repo_path)
+    repo.save_template("first", AppConfig(monitor=2))
+
+    reads: list[Path] = []
+    original_read_bytes = Path.read_bytes
+
+    def tracking_read_bytes(self: Path) -> bytes:
+        reads.append(self)
+        return original_read_bytes(self)
+
+    monkeypatch.setattr(Path, "read_bytes", tracking_read_bytes)
+
+    repo.save_template("second", AppConfig(monitor=3))
+    assert set(repo.list_templates()) == {"first", "second"}
+    assert reads == []
+
+    other = ConfigRepository(path=repo_path)
+    other.delete_template("first")
+    assert set(repo.list_templates()) == {"second"}
+    assert reads
+
+
+def test_from_dict_applies_defaults_for_missing_keys() -> None:
+    config = AppConfig.from_dict({"monitor": "2", "wait_timeout": None, "hotkeys": {"stop": "F9"}})
+
+    assert config.monitor == 2
+    assert config.capture_mode is CaptureMode.ACTIVE_WINDOW
+    assert config.wait_timeout is None
+    assert config.output_dir == Path.home() / "Pictures" / "SCU"
+    assert config.hotkeys.pause == "Ctrl+Alt+P"
+    assert config.hotkeys.stop == "F9"
+    assert AppConfig.from_dict(config.to_dict()) == config
+
+
+def test_to_dict_returns_independent_copies() -> None:
+    config = AppConfig(monitor=2)
+
+    first = config.to_dict()
+    first["monitor"] = 5
+    first["hotkeys"]["pause"] = "F1"  # type: ignore[index]
+
+    second = config.to_dict()
+    assert second["monitor"] == 2
+    assert second["hotkeys"] == {"pause": "Ctrl+Alt+P", "stop": "Ctrl+Alt+S"}
+
+
+def test_from_dict_rejects_unknown_enum_values() -> None:
+    with pytest.raises(ValueError, match="CaptureMode"):
+        AppConfig.from_dict({"capture_mode": "whole-desktop"})
+    with pytest.raises(ValueError, match="CaptureMode"):
+        AppConfig.from_dict({"capture_mode": ["full-monitor"]})
+
+
+def test_output_dir_expands_home() -> None:
+    assert AppConfig(output_dir="~/captures").output_dir == Path.home() / "captures"
+    assert AppConfig(output_dir=Path("~")).output_dir == Path.home()
+
+
+def test_save_replaces_file_atomically(tmp_path: Path) -> None:
+    repo_path = tmp_path / "cfg.json"
+    repo = ConfigRepository(path=repo_path)
+    repo.save_recent(AppConfig(monitor=2))
+    repo.save_recent(AppConfig(monitor=4))
+
+    assert [path.name for path in tmp_path.iterdir()] == ["cfg.json"]
+    assert ConfigRepository(path=repo_path).load_recent().monitor == 4
+
+
+def test_template_store_from_empty_dict_matches_defaults() -> None:
+    assert TemplateStore.from_dict({}) == TemplateStore()
+    assert TemplateStore.from_dict({"recent": {}, "templates": {}}) == TemplateStore()
+
+
+def test_missing_keys_default_like_app_config() -> None:
+    assert AppConfig.from_dict({"monitor": 1}) == AppConfig()
+    assert TemplateStore.from_dict({"recent": {"monitor": 1}}).recent == TemplateStore.from_dict({"recent": {}}).recent
@@ -0,0 +1,121 @@
+import hashlib
+
+import pytest
+
+from scu.duplicates import (
+    UNBOUNDED_HISTORY,
+    BloomDuplicateDetector,
+    RingBufferDuplicateDetector,
+    SimpleDuplicateDetector,
+    create_duplicate_detector,
+)
+
+
+def _digest(index: int) -> bytes:
+    return hashlib.sha1(f"frame-{index}".encode()).digest()
+
+
+def test_bloom_detector_remembers_hashes() -> None:
+    detector = BloomDuplicateDetector(capacity=100)
+
+    assert detector.is_duplicate(_digest(1)) is False
+    detector.remember(_digest(1))
+    assert detector.is_duplicate(_digest(1)) is True
+
+
+def test_bloom_detector_false_positive_rate_is_bounded() -> None:
+    detector = BloomDuplicateDetector(capacity=2000, false_positive_rate=0.01)
+    for index in range(2000):
+        detector.remember(_digest(index))
+
+    false_positives = sum(detector.is_duplicate(_digest(index)) for index in range(2000, 12000))
+    assert false_positives < 300
+
+
+def test_bloom_detector_accepts_short_hashes() -> None:
+    detector = BloomDuplicateDetector(capacity=10)
+    detector.remember(b"abc")
+
+    assert detector.is_duplicate(b"abc") is True
+
+
+def test_bloom_detector_rejects_invalid_parameters() -> None:
+    with pytest.raises(ValueError):
+        BloomDuplicateDetector(capacity=0)
+    with pytest.raises(ValueError):
+        BloomDuplicateDetector(false_positive_rate=1.0)
+
+
+def test_ring_buffer_detector_evicts_oldest_hashes() -> None:
+    detector = RingBufferDuplicateDetector(capacity=2)
+    for index in range(3):
+        detector.remember(_digest(index))
+
+    assert detector.is_duplicate(_digest(0)) is False
+    assert detector.is_duplicate(_digest(1)) is True
+    assert detector.is_duplicate(_digest(2)) is True
+
+
+def test_ring_buffer_detector_keeps_repeated_hash_until_last_copy_evicted() -> None:
+    detector = RingBufferDuplicateDetector(capacity=2)
+    detector.remember(_digest(1))
+    detector.remember(_digest(1))
+    detector.remember(_digest(2))
+
+    assert detector.is_duplicate(_digest(1)) is True
+    detector.remember(_digest(3))
+    assert detector.is_duplicate(_digest(1)) is False
+
+
+def test_ring_buffer_prefilter_only_holds_live_hashes_after_a_lap() -> None:
+    detector = RingBufferDuplicateDetector(capacity=4, filter_bits=1 << 16)
+    for index in range(40):
+        detector.remember(_digest(index))
+
+    assert sum(bin(byte).count("1") for byte in detector._filter) <= 4
+    assert all(detector.is_duplicate(_digest(index)) for index in range(36, 40))
+
+
+def test_ring_buffer_detector_rejects_invalid_parameters() -> None:
+    with pytest.raises(ValueError):
+        RingBufferDuplicateDetector(capacity=0)
+    with pytest.raises(ValueError):
+        RingBufferDuplicateDetector(filter_bits=1000)
+
+
+def test_factory_switches_on_expected_captures() -> None:
+    assert isinstance(create_duplicate_detector(100), SimpleDuplicateDetector)
+    assert isinstance(create_duplicate_detector(5000), BloomDuplicateDetector)
+    assert isinstance(create_duplicate_detector(None), RingBufferDuplicateDetector)
+
+
+def test_unbounded_detector_stays_exact_past_capacity() -> None:
+    detector = create_duplicate_detector(None)
+    false_positives = sum(detector.observe(_digest(index)) for index in range(4 * UNBOUNDED_HISTORY))
+
+    assert false_positives == 0
+    assert detector.observe(_digest(4 * UNBOUNDED_HISTORY - 1)) is True
+
+
+@pytest.mark.parametrize(
+    "detector",
+    [SimpleDuplicateDetector(), BloomDuplicateDetector(capacity=100), RingBufferDuplicateDetector(capacity=4)],
+    ids=["simple", "bloom", "ring"],
+)
+def test_observe_reports_previously_seen_hashes(detector) -> None:
+    assert detector.observe(_digest(1)) is False
+    assert detector.observe(_digest(1)) is True
+    assert detector.is_duplicate(_digest(1)) is True
+    assert detector.observe(_digest(2)) is False
+
+
+@pytest.mark.parametrize(
+    "detector",
+    [SimpleDuplicateDetector(), BloomDuplicateDetector(capacity=100), RingBufferDuplicateDetector(capacity=4)],
+    ids=["simple", "bloom", "ring"],
+)
+def test_reset_forgets_remembered_hashes(detector) -> None:
+    detector.remember(_digest(1))
+    detector.reset()
+
+    assert detector.is_duplicate(_digest(1)) is False
@@ -0,0 +1,9 @@
+import sys
+
+import scu.gui
+
+
+def test_importing_gui_does_not_load_qt() -> None:
+    assert callable(scu.gui.main)
+    assert "scu.gui.window" not in sys.modules
+    assert "PySide6.QtWidgets" not in sys.modules
@@ -0,0 +1,28 @@
+from scu import hashing
+from scu.hashing import band_digests, collect_band_digests, hash_bytes, hash_image
+from scu.interfaces import RawImage
+from scu.output import SessionPathManager
+
+
+def _image() -> RawImage:
+    pixels = bytes(range(256)) * 32
+    return RawImage(pixels=memoryview(pixels), width=4, height=len(pixels) // 16)
+
+
+def test_hash_image_hashes_raw_pixel_bands() -> None:
+    image = _image()
+
+    bands = list(band_digests(image))
+    assert len(bands) == 8
+    assert hash_image(image) == hash_bytes(b"".join(bands))
+
+
+def test_hash_image_hashes_encoded_bytes_directly() -> None:
+    assert hash_image(b"frame") == hash_bytes(b"frame") == SessionPathManager.hash_bytes(b"frame")
+
+
+def test_collect_band_digests_matches_sequential_digests(monkeypatch) -> None:
+    monkeypatch.setattr(hashing, "_PARALLEL_HASH_MIN_BYTES", 0)
+    image = _image()
+
+    assert collect_band_digests(image) == list(band_digests(image))
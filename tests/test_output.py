@@ -22,3 +22,16 @@ def test_capture_path_uses_zero_padding(tmp_path: Path) -> None:
     manager.prepare_session_dir(session_name="manual")
     path = manager.capture_path(7, ImageFormat.PNG)
     assert path.name == "page_0007.png"
+
+
+def test_hash_bytes_returns_raw_digest() -> None:
+    digest = SessionPathManager.hash_bytes(b"frame")
+
+    assert isinstance(digest, bytes)
+    assert digest == SessionPathManager.hash_bytes(b"frame")
+    assert digest != SessionPathManager.hash_bytes(b"other")
+
+
+def test_image_format_extensions() -> None:
+    assert ImageFormat.PNG.extension == ".png"
+    assert ImageFormat.JPG.extension == ".jpg"
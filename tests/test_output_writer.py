@@ -1,7 +1,10 @@
 from pathlib import Path
 
+import pytest
+
 from scu.config import ImageFormat
-from scu.output import FilesystemOutputWriter
+from scu.interfaces import RawImage
+from scu.output import BackgroundOutputWriter, FilesystemOutputWriter
 
 
 def test_filesystem_output_writer_persists_bytes(tmp_path: Path) -> None:
@@ -18,3 +21,87 @@ def test_filesystem_output_writer_persists_bytes(tmp_path: Path) -> None:
 
     assert result == session_dir / "page_0001.png"
     assert result.read_bytes() == b"payload"
+
+
+def test_filesystem_output_writer_creates_directory_once(tmp_path: Path, monkeypatch) -> None:
+    writer = FilesystemOutputWriter()
+    session_dir = tmp_path / "session"
+    created: list[Path] = []
+    original_mkdir = Path.mkdir
+
+    def tracking_mkdir(self: Path, *args, **kwargs) -> None:
+        created.append(self)
+        original_mkdir(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "mkdir", tracking_mkdir)
+
+    for index in (1, 2, 3):
+        writer.write_capture(
+            session_dir=session_dir,
+            index=index,
+            image_format=ImageFormat.PNG,
+            image_bytes=b"payload",
+            jpeg_quality=90,
+        )
+
+    assert created == [session_dir]
+    assert sorted(p.name for p in session_dir.iterdir()) == ["page_0001.png", "page_0002.png", "page_0003.png"]
+
+
+def test_background_output_writer_flushes_on_close(tmp_path: Path) -> None:
+    session_dir = tmp_path / "session"
+
+    with BackgroundOutputWriter(max_pending=2) as writer:
+        paths = [
+            writer.write_capture(
+                session_dir=session_dir,
+                index=index,
+                image_format=ImageFormat.JPG,
+                image_bytes=f"frame-{index}".encode(),
+                jpeg_quality=90,
+            )
+            for index in range(1, 6)
+        ]
+
+    assert [path.name for path in paths] == [f"page_{index:04d}.jpg" for index in range(1, 6)]
+    assert [path.read_bytes() for path in paths] == [f"frame-{index}".encode() for index in range(1, 6)]
+
+
+def test_background_output_writer_reraises_io_errors(tmp_path: Path) -> None:
+    writer = BackgroundOutputWriter()
+    # Occupy the capture path with a directory so the I/O thread fails to open it.
+    (tmp_path / "page_0001.png").mkdir()
+
+    writer.write_capture(
+        session_dir=tmp_path,
+        index=1,
+        image_format=ImageFormat.PNG,
+        image_bytes=b"payload",
+        jpeg_quality=90,
+    )
+
+    with pytest.raises(OSError):
+        writer.close()
+
+
+@pytest.mark.parametrize("image_format, pil_format", [(ImageFormat.PNG, "PNG"), (ImageFormat.JPG, "JPEG")])
+def test_output_writers_encode_raw_images(tmp_path: Path, image_format: ImageFormat, pil_format: str) -> None:
+    Image = pytest.importorskip("PIL.Image")
+    # 2x1 BGRA pixels: pure blue then pure red.
+    raw = RawImage(pixels=bytes([255, 0, 0, 0, 0, 0, 255, 0]), width=2, height=1)
+
+    with BackgroundOutputWriter() as writer:
+        path = writer.write_capture(
+            session_dir=tmp_path,
+            index=1,
+            image_format=image_format,
+            image_bytes=raw,
+            jpeg_quality=95,
+        )
+
+    with Image.open(path) as image:
+        assert image.format == pil_format
+        assert image.mode == "RGB"
+        assert image.size == (2, 1)
+        if image_format is ImageFormat.PNG:
+            assert [image.getpixel((x, 0)) for x in range(2)] == [(0, 0, 255), (255, 0, 0)]
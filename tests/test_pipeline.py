@@ -1,17 +1,40 @@
-from dataclasses import dataclass
+from dataclasses import replace
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Tuple
 
-from scu.config import AppConfig, ProcessOrder, WaitMode
+import pytest
+
+from scu.config import AppConfig, ImageFormat, ProcessOrder, WaitMode
 from scu.duplicates import SimpleDuplicateDetector
-from scu.interfaces import CaptureRequest, CaptureResult, CaptureService, InputService, WaitService
+from scu.interfaces import (
+    CaptureRequest,
+    CaptureResult,
+    CaptureService,
+    InputService,
+    OutputWriter,
+    RawImage,
+    WaitService,
+)
 from scu.output import FilesystemOutputWriter, SessionPathManager
 from scu.pipeline import Pipeline, SessionContext
 
 
-@dataclass
-class RecordedCall:
-    name: str
+# Recorded service calls as (kind, argument) tuples; nothing is formatted per call.
+Call = Tuple[str, Any]
+
+# Shared by every test; the autouse fixture below clears it between tests.
+_DETECTOR = SimpleDuplicateDetector()
+
+
+@pytest.fixture(autouse=True)
+def _reset_detector() -> None:
+    _DETECTOR.reset()
+
+
+@lru_cache(maxsize=None)
+def _payload(index: int) -> bytes:
+    return f"frame-{index}".encode()
 
 
 class FakeCaptureService(CaptureService):
@@ -20,34 +43,54 @@ class FakeCaptureService(CaptureService):
 
     def capture(self, request: CaptureRequest) -> CaptureResult:  # type: ignore[override]
         self.count += 1
-        data = f"frame-{self.count}".encode()
-        return CaptureResult(image_bytes=data, width=100, height=100, hash_value=None)
+        return CaptureResult(image_bytes=_payload(self.count), width=100, height=100, hash_value=None)
 
 
 class RecordingInputService(InputService):
-    def __init__(self, calls: List[RecordedCall]) -> None:
+    def __init__(self, calls: List[Call]) -> None:
         self.calls = calls
 
     def send_direction(self, direction) -> None:  # type: ignore[override]
-        self.calls.append(RecordedCall(f"send-{direction.value}"))
+        self.calls.append(("send", direction.value))
 
 
 class RecordingWaitService(WaitService):
-    def __init__(self, calls: List[RecordedCall], change_result: bool = True) -> None:
+    def __init__(self, calls: List[Call], change_result: bool = True) -> None:
         self.calls = calls
         self.change_result = change_result
 
+    def arm(self) -> None:
+        self.calls.append(("arm", None))
+
     def wait_fixed(self, delay_seconds: float) -> None:  # type: ignore[override]
-        self.calls.append(RecordedCall(f"wait-fixed-{delay_seconds}"))
+        self.calls.append(("wait-fixed", delay_seconds))
 
     def wait_for_change(self, previous_hash, timeout_seconds: float) -> bool:  # type: ignore[override]
-        self.calls.append(RecordedCall(f"wait-change-{timeout_seconds}"))
+        self.calls.append(("wait-change", timeout_seconds))
         return self.change_result
 
 
-def test_pipeline_observes_key_first_order(tmp_path: Path) -> None:
-    calls: List[RecordedCall] = []
-    config = AppConfig(output_dir=tmp_path, process_order=ProcessOrder.KEY_FIRST)
+class InMemoryOutputWriter(OutputWriter):
+    def __init__(self) -> None:
+        self.records: Dict[Path, bytes | RawImage] = {}
+
+    def write_capture(  # type: ignore[override]
+        self,
+        session_dir: Path,
+        index: int,
+        image_format: ImageFormat,
+        image_bytes: bytes | RawImage,
+        jpeg_quality: int,
+    ) -> Path:
+        path = session_dir / f"page_{index:04d}{image_format.extension}"
+        self.records[path] = image_bytes
+        return path
+
+
+def test_pipeline_observes_key_first_order(prepared_session: Tuple[AppConfig, SessionPathManager]) -> None:
+    calls: List[Call] = []
+    base_config, manager = prepared_session
+    config = replace(base_config, process_order=ProcessOrder.KEY_FIRST)
     pipeline = Pipeline(
         capture_service=FakeCaptureService(),
         input_service=RecordingInputService(calls),
@@ -55,30 +98,78 @@ def test_pipeline_observes_key_first_order(tmp_path: Path) -> None:
         output_writer=FilesystemOutputWriter(),
     )
 
-    manager = SessionPathManager(config)
-    manager.prepare_session_dir(session_name="sess")
-    context = SessionContext(config=config, path_manager=manager, duplicate_detector=SimpleDuplicateDetector())
+    context = SessionContext(config=config, path_manager=manager, duplicate_detector=_DETECTOR)
 
     outcome = pipeline.execute_step(context, index=1)
 
-    assert calls[0].name.startswith("send-")
-    assert any(call.name.startswith("wait-fixed") for call in calls)
+    assert calls[0][0] == "send"
+    assert ("wait-fixed", config.delay) in calls
     assert outcome.image_path is not None
+    assert outcome.image_path.read_bytes() == b"frame-1"
 
 
-def test_pipeline_change_detection_warning(tmp_path: Path) -> None:
-    calls: List[RecordedCall] = []
-    config = AppConfig(output_dir=tmp_path, wait_mode=WaitMode.CHANGE_DETECTION, wait_timeout=1.0)
+def test_pipeline_change_detection_warning(prepared_session: Tuple[AppConfig, SessionPathManager]) -> None:
+    calls: List[Call] = []
+    base_config, manager = prepared_session
+    config = replace(base_config, wait_mode=WaitMode.CHANGE_DETECTION, wait_timeout=1.0)
+    writer = InMemoryOutputWriter()
     pipeline = Pipeline(
         capture_service=FakeCaptureService(),
         input_service=RecordingInputService(calls),
         wait_service=RecordingWaitService(calls, change_result=False),
-        output_writer=FilesystemOutputWriter(),
+        output_writer=writer,
     )
-    manager = SessionPathManager(config)
-    manager.prepare_session_dir(session_name="sess")
-    context = SessionContext(config=config, path_manager=manager, duplicate_detector=SimpleDuplicateDetector())
+    context = SessionContext(config=config, path_manager=manager, duplicate_detector=_DETECTOR)
 
     outcome = pipeline.execute_step(context, index=1)
     assert len(outcome.warnings) == 1
     assert "No visual change" in outcome.warnings[0].message
+    assert writer.records == {outcome.image_path: b"frame-1"}
+
+
+class RecordingCaptureService(FakeCaptureService):
+    def __init__(self, calls: List[Call]) -> None:
+        super().__init__()
+        self.calls = calls
+
+    def capture(self, request: CaptureRequest) -> CaptureResult:  # type: ignore[override]
+        self.calls.append(("capture", request.monitor))
+        return super().capture(request)
+
+
+def test_pipeline_recompiles_when_config_changes(prepared_session: Tuple[AppConfig, SessionPathManager]) -> None:
+    calls: List[Call] = []
+    base_config, manager = prepared_session
+    key_first = replace(base_config, process_order=ProcessOrder.KEY_FIRST)
+    shot_first = replace(base_config, process_order=ProcessOrder.SHOT_FIRST)
+    pipeline = Pipeline(
+        capture_service=RecordingCaptureService(calls),
+        input_service=RecordingInputService(calls),
+        wait_service=RecordingWaitService(calls),
+        output_writer=InMemoryOutputWriter(),
+    )
+
+    pipeline.execute_step(SessionContext(config=key_first, path_manager=manager, duplicate_detector=_DETECTOR), index=1)
+    assert [kind for kind, _ in calls] == ["send", "capture", "wait-fixed"]
+
+    calls.clear()
+    pipeline.execute_step(SessionContext(config=shot_first, path_manager=manager, duplicate_detector=_DETECTOR), index=2)
+    assert [kind for kind, _ in calls] == ["capture", "send", "wait-fixed"]
+
+
+def test_pipeline_arms_change_detection_before_sending_key(
+    prepared_session: Tuple[AppConfig, SessionPathManager],
+) -> None:
+    calls: List[Call] = []
+    base_config, manager = prepared_session
+    config = replace(base_config, process_order=ProcessOrder.KEY_FIRST, wait_mode=WaitMode.CHANGE_DETECTION)
+    pipeline = Pipeline(
+        capture_service=RecordingCaptureService(calls),
+        input_service=RecordingInputService(calls),
+        wait_service=RecordingWaitService(calls),
+        output_writer=InMemoryOutputWriter(),
+    )
+
+    pipeline.execute_step(SessionContext(config=config, path_manager=manager, duplicate_detector=_DETECTOR), index=1)
+
+    assert [kind for kind, _ in calls] == ["arm", "send", "capture", "wait-change"]
@@ -1,40 +1,52 @@
 from __future__ import annotations
 
+from collections import defaultdict, deque
+from dataclasses import replace
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Callable, List
+from typing import DefaultDict, List
 
 from scu.config import AppConfig, SessionMode
 from scu.events import ErrorEvent, ProgressEvent, StateChangeEvent
 from scu.pipeline import SessionContext, StepOutcome
 from scu.session import SessionController, SessionState
 
+# Tests derive their configs from one template; every replace() still runs AppConfig validation.
+_BASE = AppConfig()
+
 
 class StubPipeline:
     def __init__(self, outcomes: List[StepOutcome] | None = None, *, raise_on_step: bool = False) -> None:
-        self.outcomes = outcomes or []
+        self.outcomes = deque(outcomes or [])
         self.raise_on_step = raise_on_step
+        self.contexts: List[SessionContext] = []
 
     def execute_step(self, context: SessionContext, index: int) -> StepOutcome:
+        self.contexts.append(context)
         if self.raise_on_step:
             raise RuntimeError("capture failed")
         if self.outcomes:
-            return self.outcomes.pop(0)
+            return self.outcomes.popleft()
         return StepOutcome(index=index, image_path=None, hash_value=None, warnings=[])
 
 
-def collect_events(event_list: List) -> Callable:
-    def _collector(event) -> None:
-        event_list.append(event)
+class EventSink(list):
+    """Event callback that also indexes events by type."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.by_type: DefaultDict[type, List] = defaultdict(list)
 
-    return _collector
+    def __call__(self, event) -> None:
+        self.append(event)
+        self.by_type[type(event)].append(event)
 
 
 def test_session_progress_and_completion(tmp_path: Path) -> None:
-    config = AppConfig(output_dir=tmp_path, session_mode=SessionMode.FIXED_COUNT, count=2)
-    events: List = []
+    config = replace(_BASE, output_dir=tmp_path, session_mode=SessionMode.FIXED_COUNT, count=2)
+    events = EventSink()
     pipeline = StubPipeline()
-    controller = SessionController(config=config, pipeline=pipeline, event_callback=collect_events(events))  # type: ignore[arg-type]
+    controller = SessionController(config=config, pipeline=pipeline, event_callback=events)  # type: ignore[arg-type]
 
     controller.start(now=datetime(2024, 1, 1, 0, 0, 0), session_name="test")
     assert controller.state == SessionState.RUNNING
@@ -42,17 +54,15 @@ def test_session_progress_and_completion(tmp_path: Path) -> None:
     controller.step()
     assert controller.state == SessionState.STOPPED
 
-    progress_events = [e for e in events if isinstance(e, ProgressEvent)]
-    assert len(progress_events) == 2
-    state_events = [e for e in events if isinstance(e, StateChangeEvent)]
-    assert state_events[-1].state == SessionState.STOPPED.value
+    assert len(events.by_type[ProgressEvent]) == 2
+    assert events.by_type[StateChangeEvent][-1].state == SessionState.STOPPED.value
 
 
 def test_session_handles_errors(tmp_path: Path) -> None:
-    config = AppConfig(output_dir=tmp_path)
-    events: List = []
+    config = replace(_BASE, output_dir=tmp_path)
+    events = EventSink()
     pipeline = StubPipeline(raise_on_step=True)
-    controller = SessionController(config=config, pipeline=pipeline, event_callback=collect_events(events))  # type: ignore[arg-type]
+    controller = SessionController(config=config, pipeline=pipeline, event_callback=events)  # type: ignore[arg-type]
     controller.start(session_name="err")
 
     try:
@@ -61,16 +71,31 @@ def test_session_handles_errors(tmp_path: Path) -> None:
         pass
 
     assert controller.state == SessionState.ERROR
-    assert any(isinstance(e, ErrorEvent) for e in events)
+    assert events.by_type[ErrorEvent]
 
 
 def test_time_limit_stops_automatically(tmp_path: Path) -> None:
-    config = AppConfig(output_dir=tmp_path, session_mode=SessionMode.TIME_LIMIT, time_limit_seconds=1)
-    events: List = []
+    config = replace(_BASE, output_dir=tmp_path, session_mode=SessionMode.TIME_LIMIT, time_limit_seconds=1)
+    events = EventSink()
     pipeline = StubPipeline()
-    controller = SessionController(config=config, pipeline=pipeline, event_callback=collect_events(events))  # type: ignore[arg-type]
-    start_time = datetime.now() - timedelta(seconds=2)
+    controller = SessionController(config=config, pipeline=pipeline, event_callback=events)  # type: ignore[arg-type]
+    start_time = datetime(2024, 1, 1, 0, 0, 0)
     controller.start(now=start_time, session_name="time")
 
-    controller.step()
+    controller.step(now=start_time + timedelta(milliseconds=500))
+    assert controller.state == SessionState.RUNNING
+    controller.step(now=start_time + timedelta(seconds=2))
     assert controller.state == SessionState.STOPPED
+
+
+def test_session_reuses_context_across_steps(tmp_path: Path) -> None:
+    config = replace(_BASE, output_dir=tmp_path, session_mode=SessionMode.FIXED_COUNT, count=2)
+    pipeline = StubPipeline()
+    controller = SessionController(config=config, pipeline=pipeline, event_callback=EventSink())  # type: ignore[arg-type]
+
+    controller.start(session_name="ctx")
+    controller.step()
+    controller.step()
+
+    assert len(pipeline.contexts) == 2
+    assert pipeline.contexts[0] is pipeline.contexts[1]
@@ -2,14 +2,20 @@ from __future__ import annotations
 
 import hashlib
 import sys
+import threading
 
 import pytest
 
 from scu.config import CaptureMode, Direction
-from scu.interfaces import CaptureRequest
+from scu.interfaces import CaptureRequest, CaptureResult, RawImage
+from scu.hashing import band_digests, hash_image
 from scu.platform.windows import Rect, Win32CaptureService, Win32InputService, Win32WaitService
 
 
+def _fake_capture_digest(rect: Rect) -> bytes:
+    return hashlib.sha1(f"capture:{rect.left},{rect.top},{rect.right},{rect.bottom}".encode()).digest()
+
+
 class FakeWin32API:
     def __init__(self) -> None:
         self.monitors = [Rect(0, 0, 1920, 1080)]
@@ -23,29 +29,58 @@ class FakeWin32API:
     def get_foreground_window_rect(self) -> Rect | None:
         return self.foreground
 
-    def capture_rect(self, rect: Rect) -> bytes:
+    def capture_rect(self, rect: Rect) -> CaptureResult:
         self.captured_rects.append(rect)
-        return f"capture:{rect.left},{rect.top},{rect.right},{rect.bottom}".encode()
+        data = f"capture:{rect.left},{rect.top},{rect.right},{rect.bottom}".encode()
+        return CaptureResult(image_bytes=data, width=rect.width, height=rect.height, hash_value=_fake_capture_digest(rect))
 
     def send_key(self, vk_code: int) -> None:
         self.sent_keys.append(vk_code)
 
 
+class RawFrameWin32API(FakeWin32API):
+    """Serves raw frames like RealWin32API, leaving hashing to the service."""
+
+    def __init__(self, frames: list[bytes]) -> None:
+        super().__init__()
+        self.monitors = [Rect(0, 0, 4, 256)]
+        self.frames = frames
+
+    def capture_rect(self, rect: Rect) -> CaptureResult:
+        self.captured_rects.append(rect)
+        pixels = self.frames.pop(0) if len(self.frames) > 1 else self.frames[0]
+        return CaptureResult(image_bytes=RawImage(pixels, rect.width, rect.height), width=rect.width, height=rect.height)
+
+
 class FakeTimer:
+    """Deterministic clock; time is kept in integer microseconds so sums do not drift."""
+
     def __init__(self) -> None:
-        self.current = 0.0
+        self.current_us = 0
         self.slept: list[float] = []
 
     def sleep(self, delay: float) -> None:
         self.slept.append(delay)
-        self.current += max(0.0, delay)
+        self.current_us += max(0, round(delay * 1_000_000))
 
     def monotonic(self) -> float:
-        return self.current
+        return self.current_us / 1_000_000
+
+
+@pytest.fixture(scope="module")
+def capture_hashes() -> dict[Rect, bytes]:
+    """Digests FakeWin32API produces for the rects the tests capture, computed once per module."""
+
+    rects = [Rect(0, 0, 1920, 1080), Rect(0, 10, 150, 110), Rect(100, 100, 400, 300)]
+    return {rect: _fake_capture_digest(rect) for rect in rects}
 
 
-def test_capture_full_monitor_uses_monitor_bounds() -> None:
-    api = FakeWin32API()
+@pytest.fixture
+def api() -> FakeWin32API:
+    return FakeWin32API()
+
+
+def test_capture_full_monitor_uses_monitor_bounds(api: FakeWin32API, capture_hashes: dict[Rect, bytes]) -> None:
     service = Win32CaptureService(api=api)
     request = CaptureRequest(monitor=1, capture_mode=CaptureMode.FULL_MONITOR, min_overlap=0.5)
 
@@ -54,13 +89,11 @@ def test_capture_full_monitor_uses_monitor_bounds() -> None:
     assert result.width == 1920
     assert result.height == 1080
     assert api.captured_rects[-1] == api.monitors[0]
-    assert result.hash_value == hashlib.sha1(b"capture:0,0,1920,1080").hexdigest()
+    assert result.hash_value == capture_hashes[api.monitors[0]]
 
 
+@pytest.mark.skipif(sys.platform == "win32", reason="platform check only relevant for non-Windows CI")
 def test_services_require_windows_when_no_api() -> None:
-    if sys.platform == "win32":
-        pytest.skip("platform check only relevant for non-Windows CI")
-
     with pytest.raises(RuntimeError):
         Win32CaptureService()
 
@@ -68,31 +101,41 @@ def test_services_require_windows_when_no_api() -> None:
         Win32InputService()
 
 
-def test_capture_active_window_clamps_to_monitor() -> None:
-    api = FakeWin32API()
-    api.foreground = Rect(-50, 10, 150, 110)  # partially outside the monitor
+@pytest.mark.parametrize(
+    ("foreground", "min_overlap", "expected_rect"),
+    [
+        (Rect(100, 100, 400, 300), 0.5, Rect(100, 100, 400, 300)),
+        (Rect(-50, 10, 150, 110), 0.1, Rect(0, 10, 150, 110)),  # partially outside the monitor
+        (Rect(1910, 0, 2100, 200), 0.8, None),  # too little of the window on the monitor
+        (None, 0.5, None),
+    ],
+    ids=["inside", "clamped", "insufficient-overlap", "no-window"],
+)
+def test_capture_active_window(
+    api: FakeWin32API,
+    capture_hashes: dict[Rect, bytes],
+    foreground: Rect | None,
+    min_overlap: float,
+    expected_rect: Rect | None,
+) -> None:
+    api.foreground = foreground
     service = Win32CaptureService(api=api)
-    request = CaptureRequest(monitor=1, capture_mode=CaptureMode.ACTIVE_WINDOW, min_overlap=0.1)
-
-    result = service.capture(request)
-
-    assert api.captured_rects[-1] == Rect(0, 10, 150, 110)
-    assert result.width == 150
-    assert result.height == 100
+    request = CaptureRequest(monitor=1, capture_mode=CaptureMode.ACTIVE_WINDOW, min_overlap=min_overlap)
 
+    if expected_rect is None:
+        with pytest.raises(RuntimeError):
+            service.capture(request)
+        assert api.captured_rects == []
+        return
 
-def test_capture_active_window_overlap_validation() -> None:
-    api = FakeWin32API()
-    api.foreground = Rect(1910, 0, 2100, 200)
-    service = Win32CaptureService(api=api)
-    request = CaptureRequest(monitor=1, capture_mode=CaptureMode.ACTIVE_WINDOW, min_overlap=0.8)
+    result = service.capture(request)
 
-    with pytest.raises(RuntimeError):
-        service.capture(request)
+    assert api.captured_rects[-1] == expected_rect
+    assert (result.width, result.height) == (expected_rect.width, expected_rect.height)
+    assert result.hash_value == capture_hashes[expected_rect]
 
 
-def test_capture_invalid_monitor_raises() -> None:
-    api = FakeWin32API()
+def test_capture_invalid_monitor_raises(api: FakeWin32API) -> None:
     service = Win32CaptureService(api=api)
     request = CaptureRequest(monitor=2, capture_mode=CaptureMode.FULL_MONITOR, min_overlap=0.5)
 
@@ -100,8 +143,7 @@ def test_capture_invalid_monitor_raises() -> None:
         service.capture(request)
 
 
-def test_input_service_sends_correct_key() -> None:
-    api = FakeWin32API()
+def test_input_service_sends_correct_key(api: FakeWin32API) -> None:
     input_service = Win32InputService(api=api)
 
     input_service.send_direction(Direction.LEFT)
@@ -112,30 +154,30 @@ def test_input_service_sends_correct_key() -> None:
 
 def test_wait_service_detects_change_before_timeout() -> None:
     timer = FakeTimer()
-    hashes = iter(["abc", "abc", "def"])
+    hashes = iter([b"abc", b"abc", b"def"])
     service = Win32WaitService(
-        change_detector=lambda: next(hashes, "def"),
+        change_detector=lambda: next(hashes, b"def"),
         poll_interval=0.2,
         sleep_fn=timer.sleep,
         monotonic_fn=timer.monotonic,
     )
 
-    assert service.wait_for_change("abc", 1.0) is True
+    assert service.wait_for_change(b"abc", 1.0) is True
     # slept at least twice (one poll + exit)
-    assert timer.current >= 0.2
+    assert timer.current_us >= 200_000
 
 
 def test_wait_service_times_out_when_no_change() -> None:
     timer = FakeTimer()
     service = Win32WaitService(
-        change_detector=lambda: "same",
+        change_detector=lambda: b"same",
         poll_interval=0.2,
         sleep_fn=timer.sleep,
         monotonic_fn=timer.monotonic,
     )
 
-    assert service.wait_for_change("same", 0.5) is False
-    assert timer.current == pytest.approx(0.5, rel=1e-6)
+    assert service.wait_for_change(b"same", 0.5) is False
+    assert timer.current_us == 500_000
 
 
 def test_wait_fixed_uses_sleep() -> None:
@@ -144,4 +186,176 @@ def test_wait_fixed_uses_sleep() -> None:
 
     service.wait_fixed(0.3)
 
-    assert timer.current == pytest.approx(0.3, rel=1e-6)
+    assert timer.current_us == 300_000
+
+
+def test_rect_geometry_is_precomputed() -> None:
+    rect = Rect(10, 20, 110, 70)
+
+    assert (rect.width, rect.height, rect.area) == (100, 50, 5000)
+    assert Rect(5, 5, 0, 0).area == 0
+    assert rect == Rect(10, 20, 110, 70)
+    assert rect.overlap_ratio(Rect(60, 20, 200, 70)) == pytest.approx(0.5)
+    assert repr(rect) == "Rect(left=10, top=20, right=110, bottom=70)"
+
+
+def test_capture_caches_monitor_layout_until_invalidated(api: FakeWin32API) -> None:
+    calls: list[int] = []
+    list_monitors = api.list_monitors
+
+    def counting_list_monitors() -> list[Rect]:
+        calls.append(1)
+        return list_monitors()
+
+    api.list_monitors = counting_list_monitors  # type: ignore[method-assign]
+    service = Win32CaptureService(api=api)
+    request = CaptureRequest(monitor=1, capture_mode=CaptureMode.FULL_MONITOR, min_overlap=0.5)
+
+    service.capture(request)
+    service.capture(request)
+    assert len(calls) == 1
+
+    api.monitors = [Rect(0, 0, 1280, 720)]
+    service.invalidate_monitors()
+    assert service.capture(request).width == 1280
+    assert len(calls) == 2
+
+
+def test_invalidating_monitors_releases_cached_capture_handles(api: FakeWin32API) -> None:
+    closed: list[int] = []
+    api.close = lambda: closed.append(1)  # type: ignore[attr-defined]
+    service = Win32CaptureService(api=api)
+    request = CaptureRequest(monitor=1, capture_mode=CaptureMode.FULL_MONITOR, min_overlap=0.5)
+    service.capture(request)
+    closed.clear()
+
+    service.capture(request)
+    assert closed == []
+
+    service.invalidate_monitors()
+    service.capture(request)
+    assert closed == [1]
+
+
+def test_capture_refreshes_layout_for_new_monitor(api: FakeWin32API) -> None:
+    service = Win32CaptureService(api=api)
+    service.capture(CaptureRequest(monitor=1, capture_mode=CaptureMode.FULL_MONITOR, min_overlap=0.5))
+
+    api.monitors = [Rect(0, 0, 1920, 1080), Rect(1920, 0, 3840, 1080)]
+    result = service.capture(CaptureRequest(monitor=2, capture_mode=CaptureMode.FULL_MONITOR, min_overlap=0.5))
+
+    assert api.captured_rects[-1] == Rect(1920, 0, 3840, 1080)
+    assert result.width == 1920
+
+
+@pytest.mark.slow
+def test_wait_service_blocks_on_change_event() -> None:
+    change_event = threading.Event()
+    service = Win32WaitService(change_event=change_event)
+    timer = threading.Timer(0.01, change_event.set)
+    timer.start()
+    try:
+        assert service.wait_for_change(None, 5.0) is True
+    finally:
+        timer.cancel()
+    assert not change_event.is_set()
+
+
+@pytest.mark.slow
+def test_wait_service_change_event_times_out() -> None:
+    change_event = threading.Event()
+    change_event.set()  # stale signal from an earlier step is ignored
+    service = Win32WaitService(change_event=change_event)
+    service.arm()
+
+    assert service.wait_for_change(None, 0.01) is False
+
+
+def test_wait_service_keeps_events_raised_after_arming() -> None:
+    change_event = threading.Event()
+    service = Win32WaitService(change_event=change_event)
+    service.arm()
+    change_event.set()  # repaint from the key, raised while the step was still capturing
+
+    assert service.wait_for_change(None, 0.01) is True
+
+
+def test_wait_service_confirms_events_against_pixels() -> None:
+    timer = FakeTimer()
+    change_event = threading.Event()
+    hashes = iter([b"same", b"new"])
+    service = Win32WaitService(
+        change_detector=lambda: next(hashes),
+        poll_interval=0.01,
+        sleep_fn=timer.sleep,
+        monotonic_fn=timer.monotonic,
+        change_event=change_event,
+    )
+    service.arm()
+    change_event.set()  # e.g. a focus change before the page has repainted
+
+    assert service.wait_for_change(b"same", 5.0) is True
+    assert next(hashes, None) is None
+    assert not change_event.is_set()
+
+
+def test_wait_service_polls_pixels_after_a_single_early_event() -> None:
+    timer = FakeTimer()
+    change_event = threading.Event()
+    hashes = iter([b"same", b"same", b"same", b"new"])
+    service = Win32WaitService(
+        change_detector=lambda: next(hashes),
+        poll_interval=0.01,
+        sleep_fn=timer.sleep,
+        monotonic_fn=timer.monotonic,
+        change_event=change_event,
+    )
+    service.arm()
+    change_event.set()  # the only event, raised before the repaint
+
+    assert service.wait_for_change(b"same", 0.5) is True
+    assert timer.current_us == 30_000
+
+
+def test_detect_change_survives_losing_the_foreground_window(api: FakeWin32API) -> None:
+    service = Win32CaptureService(api=api)
+    request = CaptureRequest(monitor=1, capture_mode=CaptureMode.ACTIVE_WINDOW, min_overlap=0.5)
+    result = service.capture(request)
+    timer = FakeTimer()
+    wait_service = Win32WaitService(
+        change_detector=service.detect_change,
+        poll_interval=0.01,
+        sleep_fn=timer.sleep,
+        monotonic_fn=timer.monotonic,
+    )
+
+    api.foreground = None  # e.g. focus moving while the key is processed
+    assert service.detect_change() == result.hash_value
+    assert wait_service.wait_for_change(result.hash_value, 0.02) is False
+    assert api.captured_rects[-1] == Rect(100, 100, 400, 300)
+
+
+def test_detect_change_reuses_capture_hash_for_unchanged_frames() -> None:
+    frame = bytes(4 * 4 * 256)
+    api = RawFrameWin32API([frame])
+    service = Win32CaptureService(api=api)
+
+    assert service.detect_change() is None
+    result = service.capture(CaptureRequest(monitor=1, capture_mode=CaptureMode.FULL_MONITOR, min_overlap=0.5))
+
+    assert result.hash_value == hash_image(result.image_bytes)
+    assert service.detect_change() == result.hash_value
+
+
+def test_detect_change_stops_at_first_changed_band() -> None:
+    frame = bytes(4 * 4 * 256)
+    changed = b"\xff" + frame[1:]
+    api = RawFrameWin32API([frame, changed])
+    service = Win32CaptureService(api=api)
+    result = service.capture(CaptureRequest(monitor=1, capture_mode=CaptureMode.FULL_MONITOR, min_overlap=0.5))
+
+    current = service.detect_change()
+
+    assert current is not None
+    assert current != result.hash_value
+    assert current == next(band_digests(RawImage(changed, 4, 256)))